@@ -10,6 +10,7 @@ SPDX-License-Identifier: GPL-3.0-only
 """
 
 import time
+import math
 from condynsate import Animator
 import numpy as np
 
@@ -45,21 +46,41 @@ if __name__ == "__main__":
     # Start the animator. This will open the GUI and start the rendering thread
     animator.start()
 
+    # Pace the loop against a fixed deadline so that the time spent updating
+    # the animator does not add to the sleep and the loop matches the frame
+    # rate of the animator.
+    period = animator.frame_delta
+    deadline = time.perf_counter()
+
+    # Draw all of the random values used by the loop at once
     N = 200
+    rng = np.random.default_rng()
+    line_noise = rng.random(N)
+    bar_noise = rng.random(N)*2-1
+
     for i in range(N):
         percent_done = i/(N-1)
 
         # Add a point at the current step index to both lines in the line plot
-        animator.lineplot_append_point(lines[0], i, np.random.rand())
+        animator.lineplot_append_point(lines[0], i, line_noise[i])
         animator.lineplot_append_point(lines[1], i, percent_done**2)
 
         # Set the values of each bar in the bar chart to something
         if i % 4 == 0: #Every fourth step update the bars
-            animator.barchart_set_value(bars[0], percent_done**2)
-            animator.barchart_set_value(bars[1], -percent_done**3)
-            animator.barchart_set_value(bars[2], np.sin(np.pi*percent_done))
-            animator.barchart_set_value(bars[3], np.random.rand()*2-1)
-        time.sleep(0.05)
+            # All bars are set at once with a single call
+            animator.barchart_set_values(bars, [percent_done**2,
+                                                -percent_done**3,
+                                                math.sin(math.pi*percent_done),
+                                                bar_noise[i]])
+
+        # Sleep until the next deadline. If we overran it, resync instead
+        # of trying to catch up.
+        deadline += period
+        sleep_for = deadline - time.perf_counter()
+        if sleep_for > 0.0:
+            time.sleep(sleep_for)
+        else:
+            deadline = time.perf_counter()
 
     # When done, terminate the animator to gracefully exit all children threads
     animator.terminate()
@@ -7,7 +7,6 @@ This module gives example usage of the keyboard.
 SPDX-License-Identifier: GPL-3.0-only
 """
 
-import time
 import condynsate
 
 if __name__ == "__main__":
@@ -16,18 +15,17 @@ if __name__ == "__main__":
     keyboard = condynsate.Keyboard()
 
     print("Press 'esc' to end.")
-    while True:
-        # If the esc key is ever pressed, end the loop
-        if keyboard.is_pressed('esc'):
-            break
+    # If the esc key is ever pressed, end the loop
+    while not keyboard.is_pressed('esc'):
+        # Wait until a key is pressed or released. This uses no CPU while
+        # waiting. Time out every second just to check the loop condition.
+        if keyboard.await_event(timeout=1.0) != 0:
+            continue
 
         # Get every pressed key. If any pressed keys are detected, print them
         pressed = keyboard.get_pressed()
         if len(pressed) > 0:
             print(f"Keys pressed: {pressed}")
 
-        # Just to remove CPU strain
-        time.sleep(0.01)
-
     # When done, terminate ensures graceful exit of the listener thread
     keyboard.terminate()
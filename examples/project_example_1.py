@@ -14,6 +14,9 @@ from condynsate import Project
 from condynsate import __assets__ as assets
 import numpy as np
 
+# Converts radians to degrees
+RAD2DEG = 180.0 / np.pi
+
 if __name__ == "__main__":
     # Create the project
     proj = Project(keyboard = True, visualizer = True, animator = True)
@@ -68,15 +71,32 @@ if __name__ == "__main__":
     # Wait for just long enough for all the GUIs to update
     time.sleep(0.5)
 
-    # Store the name of each wheel joint for easy iteration
+    # Store each wheel joint and the pendulum joint for easy iteration
     wheel_joint_names = ('chassis_to_wheel_1', 'chassis_to_wheel_2',
                          'chassis_to_wheel_3', 'chassis_to_wheel_4',)
+    wheel_joints = tuple(cart.joints[n] for n in wheel_joint_names)
+    pen_joint = cart.joints['chassis_to_arm']
+
+    # This will offset a drawn torque arrow out of the center of the wheels
+    # so we can see them. It is required to be different between the front
+    # wheels (1 and 2) and the rear wheels (3 and 4) because they are
+    # oriented 180 degrees apart
+    wheel_offsets = (-0.05, -0.05, 0.05, 0.05)
 
     # Set control constants to keep the pendulum upright
     k=np.array([[12.99198626,  -0.47038328, 42.11150628,  -0.23519164]])
     m_e = np.zeros(4)
     n_e = np.zeros(1)
 
+    # Allocate the controller's state vector once and fill it in place at
+    # each step
+    k_vec = k[0]
+    m = np.empty(4)
+
+    # Plot points are buffered and sent to the animator in batches of this
+    # size. This is much cheaper than sending every point individually.
+    plot_batch_size = 5
+
     # Run simulations until user requests to stop
     DONE = False
     while not DONE:
@@ -93,11 +113,12 @@ if __name__ == "__main__":
             pass
 
         # Run a 10 second simulation loop
+        times, angles, positions = [], [], []
         start = time.time()
         while proj.simtime <= 10.:
             # Read the states of the pendulum and each wheel
-            pen_state = cart.joints['chassis_to_arm'].state
-            wheel_states=tuple(cart.joints[n].state for n in wheel_joint_names)
+            pen_state = pen_joint.state
+            wheel_states = tuple(j.state for j in wheel_joints)
 
             # If the pendulum angle exceeds 90 degrees, a failure condition is
             # met. Terminate the simulation loop.
@@ -107,35 +128,42 @@ if __name__ == "__main__":
 
             # Do controls calculations to determine what torque, when applied
             # to each wheel, will keep the pendulum upright.
-            m = np.array([pen_state.omega,
-                          np.mean([s.omega for s in wheel_states]),
-                          pen_state.angle,
-                          np.mean([s.angle for s in wheel_states])])
-            torque = np.clip(float((-k@(m - m_e) + n_e)[0]), -7.5, 7.5)
+            wheel_omega = 0.0
+            wheel_angle = 0.0
+            for s in wheel_states:
+                wheel_omega += s.omega
+                wheel_angle += s.angle
+            m[0] = pen_state.omega
+            m[1] = 0.25*wheel_omega
+            m[2] = pen_state.angle
+            m[3] = 0.25*wheel_angle
+            np.subtract(m, m_e, out=m)
+            torque = float(n_e[0] - np.dot(k_vec, m))
+            torque = min(max(torque, -7.5), 7.5)
 
             # Apply the torque we calculated to each wheel
-            for joint_name in wheel_joint_names:
-                # This will offset a drawn torque arrow out of the center of
-                # the wheels so we can see them. It is required to be
-                # different between the front wheels (1 and 2) and the rear
-                # wheels (3 and 4) because they are oriented 180 degrees apart
-                offset = ('3' in joint_name or '4' in joint_name)*0.1-0.05
-                cart.joints[joint_name].apply_torque(torque,
-                                                     draw_arrow=True,
-                                                     arrow_scale=0.067,
-                                                     arrow_offset=offset)
-
-            # Plot the pendulum angle against the current simulation time
-            angle_deg = pen_state.angle*180./np.pi
-            proj.animator.lineplot_append_point(plot1, proj.simtime, angle_deg)
-
-            # Plot the cart's x position against the current simulation time
-            cart_xpos = cart.state.position[0]
-            proj.animator.lineplot_append_point(plot2, proj.simtime, cart_xpos)
+            for joint, offset in zip(wheel_joints, wheel_offsets):
+                joint.apply_torque(torque, draw_arrow=True, arrow_scale=0.067,
+                                   arrow_offset=offset)
+
+            # Buffer the pendulum angle and the cart's x position against the
+            # current simulation time. Plot them once the buffer is full.
+            times.append(proj.simtime)
+            angles.append(pen_state.angle*RAD2DEG)
+            positions.append(cart.state.position[0])
+            if len(times) >= plot_batch_size:
+                proj.animator.lineplot_append_points(plot1, times, angles)
+                proj.animator.lineplot_append_points(plot2, times, positions)
+                times, angles, positions = [], [], []
 
             # Take a simulation step that attempts real time simulation
             proj.step(real_time=True, stable_step=False)
 
+        # Plot any points still left in the buffer
+        if len(times) > 0:
+            proj.animator.lineplot_append_points(plot1, times, angles)
+            proj.animator.lineplot_append_points(plot2, times, positions)
+
         # Note how long the simulation took
         print(f"Simuation took {time.time()-start:.2f} seconds.")
 
@@ -9,9 +9,19 @@ interaction with a double axis gyroscope.
 SPDX-License-Identifier: GPL-3.0-only
 """
 
+import numpy as np
 from condynsate import Project
 from condynsate import __assets__ as assets
 
+# A lookup table of flywheel colors. Each row is the (r, g, b) color of the
+# flywheel at a normalized angular velocity, omega / max_omega, evenly spaced
+# between -1 and 1. Looking up a color is faster than calculating it.
+_x = np.linspace(-1., 1., 512)
+COLOR_LUT = np.stack((np.clip(_x + 1., 0., 1.),
+                      1. - np.abs(_x),
+                      np.clip(1. - _x, 0., 1.)), axis=1)
+COLOR_LUT = tuple(tuple(c) for c in COLOR_LUT.tolist())
+
 def apply_torques(project, gryoscope):
     """
     Applies a set of torques to each of the gyroscope's gimbals according
@@ -29,19 +39,15 @@ def apply_torques(project, gryoscope):
     None.
 
     """
-    # Determine what torques to apply based on key presses
-    # Determine what torques to apply based on key presses
-    tau0 = 0.0 # Torque applied to outermost ring
-    tau0 -= 0.01 * float(project.keyboard.is_pressed('q'))
-    tau0 += 0.01 * float(project.keyboard.is_pressed('e'))
-
-    tau1 = 0.0 # Torque applied to the middle ring
-    tau1 -= 0.01 * float(project.keyboard.is_pressed('s'))
-    tau1 += 0.01 * float(project.keyboard.is_pressed('w'))
+    # Read all the keys we care about at once
+    keys = ('q', 'e', 's', 'w', 'a', 'd')
+    q, e, s, w, a, d = project.keyboard.are_pressed(keys)
 
-    tau2 = 0.0 # Torque applied to the inner ring
-    tau2 -= 0.01 * float(project.keyboard.is_pressed('a'))
-    tau2 += 0.01 * float(project.keyboard.is_pressed('d'))
+    # Determine what torques to apply based on key presses. Subtracting
+    # the flags gives -1, 0, or 1 depending on which keys are pressed.
+    tau0 = 0.01 * (e - q) # Torque applied to outermost ring
+    tau1 = 0.01 * (w - s) # Torque applied to the middle ring
+    tau2 = 0.01 * (d - a) # Torque applied to the inner ring
 
     # Apply the torques
     gryoscope.joints['base_to_A'].apply_torque(
@@ -82,13 +88,12 @@ def set_color(gryoscope, max_omega=47.1):
     # The +z body axis is the rotational axis. Isolate is
     omega = omega[2]
 
-    # Get a color based on the rotation rate
-    r = min(max(omega / max_omega + 1., 0.), 1.)
-    g = 1. - abs(omega) / max_omega
-    b = min(max(1. - omega / max_omega, 0.), 1.)
+    # Look up a color based on the rotation rate
+    idx = int((omega / max_omega + 1.) * 255.5 + 0.5)
+    color = COLOR_LUT[min(max(idx, 0), 511)]
 
     # Set the color of the core link
-    gryoscope.links['flywheel'].set_color((r, g, b)) # Returns 0 on success
+    gryoscope.links['flywheel'].set_color(color) # Returns 0 on success
 
 
 def set_omega(project, gryoscope):
@@ -109,9 +114,8 @@ def set_omega(project, gryoscope):
 
     """
     # The amount by which to iterate the wheel speed
-    iter_val = 0.0
-    iter_val -= 0.2 * float(project.keyboard.is_pressed('f'))
-    iter_val += 0.2 * float(project.keyboard.is_pressed('r'))
+    f, r = project.keyboard.are_pressed(('f', 'r'))
+    iter_val = 0.2 * (r - f)
 
     # Read the current wheel joint speed, iterate it, and set the new value
     old_omega = gryoscope.joints['C_to_flywheel'].state.omega
@@ -10,6 +10,7 @@ SPDX-License-Identifier: GPL-3.0-only
 """
 
 import time
+import numpy as np
 from condynsate import Simulator
 from condynsate import __assets__ as assets
 import matplotlib
@@ -31,20 +32,27 @@ if __name__ == "__main__":
     cart.set_initial_state(position=(0,0,0.251))
 
     # Set the pendulum joint to some non-zero initial angle
-    cart.joints['chassis_to_arm'].set_initial_state(angle=0.001)
+    pen_joint = cart.joints['chassis_to_arm']
+    pen_joint.set_initial_state(angle=0.001)
+
+    # Allocate enough space to store the data from every step of a 5 second
+    # simulation loop (plus the terminal step)
+    n = int(5.0 / sim.dt) + 2
+    pendulum_angle = np.empty(n)
+    cart_x_pos = np.empty(n)
+    simtime = np.empty(n)
 
     # Run a 5 second simulation loop
     start = time.time()
-    pendulum_angle = []
-    cart_x_pos = []
-    simtime = []
-    while sim.time < 5.0:
+    i = 0
+    while sim.time < 5.0 and i < n - 1:
         # Note the angle of the pendulum joint at each time step
         # Note the x coordinate of the cart at each time step
         # Note the simulation time at each step
-        pendulum_angle.append(cart.joints['chassis_to_arm'].state.angle)
-        cart_x_pos.append(cart.state.position[0])
-        simtime.append(sim.time)
+        pendulum_angle[i] = pen_joint.state.angle
+        cart_x_pos[i] = cart.state.position[0]
+        simtime[i] = sim.time
+        i += 1
 
         # Apply a small force the the center of mass of the cart
         cart.apply_force((-0.0275, 0.0, 0.0))
@@ -54,10 +62,14 @@ if __name__ == "__main__":
         if sim.step(real_time=False) != 0:
             break
 
-    # Note the terminate angle, position, and time
-    pendulum_angle.append(cart.joints['chassis_to_arm'].state.angle)
-    cart_x_pos.append(cart.state.position[0])
-    simtime.append(sim.time)
+    # Note the terminate angle, position, and time. Then discard any unused
+    # space.
+    pendulum_angle[i] = pen_joint.state.angle
+    cart_x_pos[i] = cart.state.position[0]
+    simtime[i] = sim.time
+    pendulum_angle = pendulum_angle[:i+1]
+    cart_x_pos = cart_x_pos[:i+1]
+    simtime = simtime[:i+1]
 
     # Print how long the simulation took in real time
     print(f"Simulation took: {(time.time() - start):.2f} seconds")
@@ -37,40 +37,54 @@ if __name__ == "__main__":
                    position=(0., 0., 0.25) # Set initial position on ground
                    )
 
+    # Precompute the cube path, orientation, and color as well as the camera
+    # path for every step of the animation
     N = 1750
     P0 = np.array([0., 0., 0.25])
     P1 = np.array([-0.5, 0.5, 4])
-    for i in range(N):
-        t = i / (N-1)
-
-        # Get the position and orientation to set the cube to
-        p = (1-t)*P0 + t*P1
-        roll = np.sin(5*t)
-        pitch = np.sin(7*t)
-        yaw = np.sin(11*t)
+    ts = np.linspace(0., 1., N)
+    positions = (1-ts)[:,None]*P0 + ts[:,None]*P1
+    rolls = np.sin(5*ts)
+    pitches = np.sin(7*ts)
+    yaws = np.sin(11*ts)
+    colors = np.clip(np.column_stack((0.121+np.sin(5*ts),
+                                      0.403+np.cos(7*ts),
+                                      0.749+np.cos(11*ts))), 0., 1.)
+    cam_positions = np.column_stack((3*np.sin(4*ts),
+                                     -3*np.cos(4*ts),
+                                     3.+4.*ts))
 
+    # Run the updates at about triple the frame rate. Each update is paced
+    # against an absolute deadline so that time spent submitting updates
+    # does not accumulate as drift
+    period = 1.0 / 180.0
+    next_t = time.monotonic()
+    for i in range(N):
         # Transform the cube to the desired position and orientation
+        p = positions[i]
         vis.set_transform('Cube',
                           position=p,
-                          roll=roll,
-                          pitch=pitch,
-                          yaw=yaw,)
+                          roll=rolls[i],
+                          pitch=pitches[i],
+                          yaw=yaws[i],)
 
-        # Select a new color to apply to the cube and apply it
-        color = (0.121+np.sin(5*t),
-                 0.403+np.cos(7*t),
-                 0.749+np.cos(11*t))
-        color = tuple(float(max(0,min(c,1))) for c in color)
-        vis.set_material('Cube', color=color)
+        # Apply a new color to the cube
+        vis.set_material('Cube', color=tuple(colors[i].tolist()))
 
         # Set the camera target to the new position of the cube
         vis.set_cam_target(p)
 
         # Move the camera's position in a dramatic way
-        vis.set_cam_position((3*np.sin(4*t), -3*np.cos(4*t), 3.+4.*t))
+        vis.set_cam_position(tuple(cam_positions[i].tolist()))
 
-        # Run the updates at about triple the frame rate
-        time.sleep(0.0056)
+        # Wait until the next update is due. If behind, resynchronize
+        # instead of rushing to catch up
+        next_t += period
+        slack = next_t - time.monotonic()
+        if slack > 0.0:
+            time.sleep(slack)
+        else:
+            next_t = time.monotonic()
 
     # When done, terminate ensure all children threads exit gracefully
     vis.terminate()
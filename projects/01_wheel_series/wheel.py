@@ -9,21 +9,22 @@ enforce a target angle.
 SPDX-License-Identifier: GPL-3.0-only
 """
 
+import math
 from time import sleep
+from collections import deque
 from condynsate import Project
 from condynsate import __assets__ as assets
 import numpy as np
 
-def _make(target):
+def _make(target, visualization):
     # Make an instance of project
-    proj = Project(keyboard = False, visualizer = True, animator = False)
+    proj = Project(keyboard=False, visualizer=visualization, animator=False)
 
-    # Turn off the axes and grid visualization.
-    proj.visualizer.set_axes(False)
-    proj.visualizer.set_grid(False)
-
-    # Make the lighting pretty
-    proj.visualizer.set_amblight(intensity=0.3)
+    # Turn off the axes and grid visualization and make the lighting pretty
+    if visualization:
+        proj.visualizer.set_axes(False)
+        proj.visualizer.set_grid(False)
+        proj.visualizer.set_amblight(intensity=0.3)
 
     # Load a plane with a tile texture for the ground
     ground = proj.load_urdf(assets['plane_medium.urdf'], fixed=True)
@@ -35,13 +36,12 @@ def _make(target):
     # Set the wheel's target angle as its initial state
     wheel.joints['axle_to_target'].set_initial_state(angle=target)
 
-    # After the initial state is set,
-    # refresh the visualizer to reflect the change
-    proj.refresh_visualizer()
-
-    # Set the camera's position and focus on wheel
-    proj.visualizer.set_cam_position((0.5, -0.75, 1.0))
-    proj.visualizer.set_cam_target(wheel.center_of_mass)
+    # After the initial state is set, refresh the visualizer to reflect the
+    # change. Then set the camera's position and focus on wheel
+    if visualization:
+        proj.refresh_visualizer()
+        proj.visualizer.set_cam_position((0.5, -0.75, 1.0))
+        proj.visualizer.set_cam_target(wheel.center_of_mass)
 
     # Remove axle friction to 0
     wheel.joints['axle_to_wheel'].set_dynamics(damping=0.0)
@@ -63,92 +63,110 @@ def _stall(proj):
     except AttributeError:
         sleep(1.333)
 
-def _wheel_state(wheel):
+def _wheel_state(axle, target):
     # Read the angle and rate of the wheel on the axle
     # Read the angle of the target arrow on the axle
-    w_st = wheel.joints['axle_to_wheel'].state
-    t_st = wheel.joints['axle_to_target'].state
+    w_st = axle.state
+    t_st = target.state
     return (w_st.angle, w_st.omega, t_st.angle)
 
-def _update_target(proj, wheel):
-    # Find an interation value such that the target rotates 60 deg/s
-    iter_val = 0.3333*np.pi*proj.simulator.dt
-
+def _update_target(proj, target, iter_val):
     try:
         # Use keypresses to determine if target angle will be updated
-        itr = 0.0
-        if proj.keyboard.is_pressed('q'):
-            itr -= iter_val
-        if proj.keyboard.is_pressed('e'):
-            itr += iter_val
+        q, e = proj.keyboard.are_pressed(('q', 'e'))
+        itr = iter_val * (e - q)
 
         # Update the target angle
-        curr = wheel.joints['axle_to_target'].state.angle
-        wheel.joints['axle_to_target'].set_state(angle=curr+itr)
+        curr = target.state.angle
+        target.set_state(angle=curr+itr)
 
     # If no keyboard exists, ignore this call
     except AttributeError:
         pass
 
-def _sim_loop(proj, wheel, get_torque, disturbance, time):
+def _sim_loop(proj, wheel, get_torque, disturbance, time, real_time):
     # Reset the project to its initial state. This is required to
     # reset the simulation, reset the visualizer, and reset/start the
     # animator
     proj.reset()
 
     # Make structure to hold simulation data
-    data = {'time':np.array([]),
-            'angle':np.array([]),
-            'angle_integral':np.array([]),
-            'angular_rate':np.array([]),
-            'target':np.array([]),
-            'target_integral':np.array([]),
-            'torque':np.array([]),
-            'disturbance':np.array([])}
+    data = {'time':deque(),
+            'angle':deque(),
+            'angular_rate':deque(),
+            'target':deque(),
+            'torque':deque(),
+            'disturbance':deque()}
+
+    # Get the wheel and target joints
+    axle = wheel.joints['axle_to_wheel']
+    target = wheel.joints['axle_to_target']
+
+    # Find an interation value such that the target rotates 60 deg/s
+    dt = proj.simulator.dt
+    iter_val = 0.3333*math.pi*dt
+
+    # Torques applied in a step accumulate, so a zero disturbance torque
+    # does not need to be applied at all
+    apply_dist = disturbance != 0.0
+
+    # Make a single state dictionary that is updated in place and passed to
+    # the controller at every step
+    state = {'angle':0.0,
+             'angle_integral':0.0,
+             'angular_rate':0.0,
+             'target':0.0,
+             'target_integral':0.0}
 
     # Run a simulation loop
     ang_int = 0.0
     tag_int = 0.0
     while proj.simtime <= time:
         # Update the target angle via keypresses (if available)
-        _update_target(proj, wheel)
+        _update_target(proj, target, iter_val)
 
         # Get and apply the controller torque
-        state = _wheel_state(wheel)
-        ang_int += state[0]*proj.simulator.dt
-        tag_int += state[2]*proj.simulator.dt
-        state = {'angle':state[0],
-                 'angle_integral':ang_int,
-                 'angular_rate':state[1],
-                 'target':state[2],
-                 'target_integral':tag_int}
+        angle, angular_rate, target_angle = _wheel_state(axle, target)
+        ang_int += angle*dt
+        tag_int += target_angle*dt
+        state['angle'] = angle
+        state['angle_integral'] = ang_int
+        state['angular_rate'] = angular_rate
+        state['target'] = target_angle
+        state['target_integral'] = tag_int
         torque = get_torque(state)
-        wheel.joints['axle_to_wheel'].apply_torque(torque,
-                                                   draw_arrow=True,
-                                                   arrow_scale=1.0,
-                                                   arrow_offset=0.075)
+        axle.apply_torque(torque,
+                          draw_arrow=real_time,
+                          arrow_scale=1.0,
+                          arrow_offset=0.075)
 
-        # Apply the disturbance torque
-        wheel.joints['axle_to_wheel'].apply_torque(disturbance)
+        # Apply the disturbance torque (if there is one)
+        if apply_dist:
+            axle.apply_torque(disturbance)
 
         # Update the data
-        data['time'] = np.append(data['time'], proj.simtime)
-        data['angle'] = np.append(data['angle'], state['angle'])
-        data['angle_integral'] = np.append(data['angle_integral'], ang_int)
-        data['angular_rate'] = np.append(data['angular_rate'],
-                                         state['angular_rate'])
-        data['target'] = np.append(data['target'], state['target'])
-        data['target_integral'] = np.append(data['target_integral'], tag_int)
-        data['torque'] = np.append(data['torque'], torque)
-        data['disturbance'] = np.append(data['disturbance'], disturbance)
+        data['time'].append(proj.simtime)
+        data['angle'].append(angle)
+        data['angular_rate'].append(angular_rate)
+        data['target'].append(target_angle)
+        data['torque'].append(torque)
+        data['disturbance'].append(disturbance)
 
         # Take a simulation step
-        proj.step(real_time=True, stable_step=False)
+        proj.step(real_time=real_time, stable_step=False)
+
+    # Convert the collected data to arrays. The integrals are the same
+    # running left Riemann sums given to the controller, so they are
+    # computed all at once instead of being collected at each step
+    for key, value in data.items():
+        data[key] = np.array(value)
+    data['angle_integral'] = np.cumsum(data['angle']*dt)
+    data['target_integral'] = np.cumsum(data['target']*dt)
 
     # Return the collected data
     return data
 
-def run(target, controller, disturbance=0.0, time=15.0):
+def run(target, controller, disturbance=0.0, time=15.0, real_time=True):
     """
     Makes and runs a condynsate-based simulation of a wheel on an axle.
     The goal of the simulation is to apply torques to the wheel such that
@@ -176,10 +194,16 @@ def run(target, controller, disturbance=0.0, time=15.0):
                 The integral of the target angle from the start of the
                 simulation to now
         Returns a float which is the torque applied to the wheel in Nm.
+        The same state dictionary is updated and passed at every time step,
+        so controller should not keep a reference to it between calls.
     disturbance : float, optional
         The disturbance torque to apply to the wheel in Nm. The default is 0.0.
     time : float, optional
         The duration of the simulation. The default is 15.0.
+    real_time : boolean, optional
+        A boolean flag that indicates if the simulation is run in real time
+        with visualization (True) or as fast as possible with no visualization
+        (False). Regardless of choice, simulation data is still gathered.
 
     Returns
     -------
@@ -209,8 +233,9 @@ def run(target, controller, disturbance=0.0, time=15.0):
 
     """
     # Build the project, run the simulation loop, terminate the project
-    proj, wheel = _make(target)
-    _stall(proj)
-    data = _sim_loop(proj, wheel, controller, disturbance, time)
+    proj, wheel = _make(target, real_time)
+    if real_time:
+        _stall(proj)
+    data = _sim_loop(proj, wheel, controller, disturbance, time, real_time)
     proj.terminate()
     return data
@@ -10,6 +10,7 @@ SPDX-License-Identifier: GPL-3.0-only
 """
 
 from time import sleep
+from warnings import warn
 from condynsate import Project
 from condynsate import __assets__ as assets
 import numpy as np
@@ -42,7 +43,8 @@ def _make(initial_angle, visualization):
     cart.joints['chassis_to_arm'].set_initial_state(angle=-initial_angle)
 
     # After the initial state is set, refresh the visualizer to show the change
-    proj.refresh_visualizer()
+    if visualization:
+        proj.refresh_visualizer()
 
     # Remove all joint friction and link air resistance
     for joint in cart.joints.values():
@@ -72,72 +74,91 @@ def _state(cart):
     w_omg = c_st.velocity[0] / c_st.position[2]
     return (-p_st.angle, -p_st.omega, w_ang, w_omg)
 
-def _sim_loop(proj, cart, get_torque, time, real_time):
+def _sim_loop(proj, cart, get_torque, time, real_time, controller_style,
+              dtype):
     # Reset the project to its initial state.
     proj.reset()
 
-    # Make structure to hold simulation data
-    data = {'time':np.array([]),
-            'angle':np.array([]),
-            'angle_integral':np.array([]),
-            'angular_rate':np.array([]),
-            'wheel':np.array([]),
-            'wheel_integral':np.array([]),
-            'wheel_rate':np.array([]),
-            'torque':np.array([]),}
+    # Make a buffer to hold the simulation data. Each row is a time step
+    # and each column is one of the collected values
+    dt = proj.simulator.dt
+    cols = ('time', 'angle', 'angle_integral', 'angular_rate', 'wheel',
+            'wheel_integral', 'wheel_rate', 'torque')
+    buf = np.empty((int(time/dt)+2, len(cols)), dtype=dtype)
+
+    # Get the wheel joint names. The drawn torque arrows are offset out of the
+    # center of the wheels so we can see them. The offset is required to be
+    # different between the front wheels (1 and 2) and the rear wheels
+    # (3 and 4) because they are oriented 180 degrees apart
+    wheel_offsets = {'chassis_to_wheel_1' : -0.05,
+                     'chassis_to_wheel_2' : -0.05,
+                     'chassis_to_wheel_3' : 0.05,
+                     'chassis_to_wheel_4' : 0.05,}
+
+    # Make a single wheel torque dictionary that is updated in place and
+    # applied at every step
+    wheel_torques = dict.fromkeys(wheel_offsets, 0.0)
+
+    # Make a single state dictionary that is updated in place and passed to
+    # the controller at every step
+    state = {'angle':0.0,
+             'angle_integral':0.0,
+             'angular_rate':0.0,
+             'wheel':0.0,
+             'wheel_integral':0.0,
+             'wheel_rate':0.0,}
 
     # Run a simulation loop
+    tuple_style = controller_style == 'tuple'
     ang_int = 0.0
     whl_int = 0.0
-    while proj.simtime <= time:
+    i = 0
+    while proj.simtime <= time and i < len(buf):
         # Get the state of the system
-        state = _state(cart)
-        ang_int += state[0]*proj.simulator.dt
-        whl_int += state[2]*proj.simulator.dt
-        state = {'angle':state[0],
-                 'angle_integral':ang_int,
-                 'angular_rate':state[1],
-                 'wheel':state[2],
-                 'wheel_integral':whl_int,
-                 'wheel_rate':state[3],}
+        angle, angular_rate, wheel, wheel_rate = _state(cart)
+        ang_int += angle*dt
+        whl_int += wheel*dt
 
         # Get the controller torque
-        torque = get_torque(state)
-        torque = np.clip(torque, -7.5, 7.5)
-        wheels = ('chassis_to_wheel_1','chassis_to_wheel_2',
-                  'chassis_to_wheel_3','chassis_to_wheel_4')
-
-        # Apply the controller torque
-        for wheel in wheels:
-            # This will offset a drawn torque arrow out of the center of
-            # the wheels so we can see them. It is required to be
-            # different between the front wheels (1 and 2) and the rear
-            # wheels (3 and 4) because they are oriented 180 degrees apart
-            offset = ('3' in wheel or '4' in wheel)*0.1-0.05
-            cart.joints[wheel].apply_torque(torque,
-                                            draw_arrow=True,
-                                            arrow_scale=0.067,
-                                            arrow_offset=offset)
+        if tuple_style:
+            torque = get_torque(angle, ang_int, angular_rate,
+                                wheel, whl_int, wheel_rate)
+        else:
+            state['angle'] = angle
+            state['angle_integral'] = ang_int
+            state['angular_rate'] = angular_rate
+            state['wheel'] = wheel
+            state['wheel_integral'] = whl_int
+            state['wheel_rate'] = wheel_rate
+            torque = get_torque(state)
+        torque = max(min(torque, 7.5), -7.5)
 
+        # Apply the controller torque to all wheels at once
+        for name in wheel_torques:
+            wheel_torques[name] = torque
+        cart.apply_joint_torques(wheel_torques,
+                                 draw_arrow=real_time,
+                                 arrow_scale=0.067,
+                                 arrow_offset=wheel_offsets)
 
         # Update the data
-        data['time'] = np.append(data['time'], proj.simtime)
-        data['angle'] = np.append(data['angle'], state['angle'])
-        data['angle_integral'] = np.append(data['angle_integral'], ang_int)
-        data['angular_rate'] = np.append(data['angular_rate'],
-                                         state['angular_rate'])
-        data['wheel'] = np.append(data['wheel'], state['wheel'])
-        data['wheel_integral'] = np.append(data['wheel_integral'], whl_int)
-        data['wheel_rate'] = np.append(data['wheel_rate'], state['wheel_rate'])
-        data['torque'] = np.append(data['torque'], torque)
+        buf[i] = (proj.simtime, angle, ang_int, angular_rate,
+                  wheel, whl_int, wheel_rate, torque)
+        i += 1
 
         # Take a simulation step
         proj.step(real_time=real_time, stable_step=False)
 
+    # Split the used part of the buffer into column views. The integrals are
+    # the full precision running sums given to the controller, cast to dtype
+    buf = buf[:i]
+    data = {name: buf[:,k] for k, name in enumerate(cols)}
+
     # Return the collected data
     return data
 
-def run(initial_angle, controller, time=30.0, real_time=True):
+def run(initial_angle, controller, time=30.0, real_time=True,
+        controller_style='dict', dtype=np.float64, as_dataframe=False):
     """
     Makes and runs a condynsate-based simulation of an inverted pendulum on
     a cart. The goal of the simulation is to apply torques to the wheels such
@@ -167,17 +188,37 @@ def run(initial_angle, controller, time=30.0, real_time=True):
             wheel_rate : float
                 The current mean angular rate of the wheels in radians / second
         Returns a float which is the torque applied to each wheel in Nm.
+        The same state dictionary is updated and passed at every time step,
+        so controller should not keep a reference to it between calls.
+        If controller_style is 'tuple', controller instead takes the same
+        values as positional arguments in the order
+        controller(angle, angle_integral, angular_rate,
+                   wheel, wheel_integral, wheel_rate)
     time : float, optional
         The duration of the simulation. The default is 30.0.
     real_time : boolean, optional
         A boolean flag that indicates if the simulation is run in real time
         with visualization (True) or as fast as possible with no visualization
         (False). Regardless of choice, simulation data is still gathered.
+    controller_style : string, optional
+        Either 'dict' or 'tuple'. Determines if the state is passed to
+        controller as a dictionary ('dict') or as positional arguments
+        ('tuple'). Positional arguments are faster to pass, which matters for
+        long runs with real_time set to False. The default is 'dict'.
+    dtype : numpy dtype, optional
+        The data type of the returned data arrays. Using np.float32 halves
+        the memory used by the data of long runs. The simulation and the
+        controller always use full precision. The default is np.float64.
+    as_dataframe : boolean, optional
+        A boolean flag that indicates if the data is returned as a
+        pandas.DataFrame whose columns are the data keys (True) instead of a
+        dictionary (False). Requires pandas. The default is False.
 
     Returns
     -------
-    data : dictionary of array-likes with length n
-        The data collected during the simulation. Has the keys:
+    data : dictionary of array-likes with length n or pandas.DataFrame
+        The data collected during the simulation. None if controller_style
+        is invalid. Has the keys:
             time : list of n floats
                 The time, in seconds, at which each data point is collected
             angle : list of n floats
@@ -204,10 +245,71 @@ def run(initial_angle, controller, time=30.0, real_time=True):
                 the n data collection points.
 
     """
-    # Build the project, run the simulation loop, terminate the project
+    data = run_many(initial_angle, (controller, ), time=time,
+                    real_time=real_time, controller_style=controller_style,
+                    dtype=dtype, as_dataframe=as_dataframe)
+    if data is None:
+        return None
+    return data[0]
+
+def run_many(initial_angle, controllers, time=30.0, real_time=True,
+             controller_style='dict', dtype=np.float64, as_dataframe=False):
+    """
+    Makes a single condynsate-based simulation of an inverted pendulum on a
+    cart and runs it once for each of a set of controllers. The project is
+    reset between runs instead of being rebuilt, which makes tuning sweeps
+    much faster than repeatedly calling run.
+
+    Parameters
+    ----------
+    initial_angle : float
+        The initial angle of the pendulum in radians. 0 is vertical.
+    controllers : iterable of functions
+        The controller functions. Each is run for one simulation. See run for
+        the controller signature.
+    time : float, optional
+        The duration of each simulation. The default is 30.0.
+    real_time : boolean, optional
+        A boolean flag that indicates if the simulations are run in real time
+        with visualization (True) or as fast as possible with no visualization
+        (False). Regardless of choice, simulation data is still gathered.
+    controller_style : string, optional
+        Either 'dict' or 'tuple'. See run. The default is 'dict'.
+    dtype : numpy dtype, optional
+        The data type of the returned data arrays. See run. The default is
+        np.float64.
+    as_dataframe : boolean, optional
+        A boolean flag that indicates if the data of each simulation is
+        returned as a pandas.DataFrame. See run. The default is False.
+
+    Returns
+    -------
+    data : list of dictionaries of array-likes or list of pandas.DataFrame
+        The data collected during each simulation, in the same order as
+        controllers. See run for the keys of each dictionary. None if
+        controller_style is invalid.
+
+    """
+    # Check the controller style before anything is built
+    if not controller_style in ('dict', 'tuple'):
+        m = "controller_style must be either 'dict' or 'tuple'."
+        warn(m, UserWarning)
+        return None
+
+    # Build the project, run a simulation loop for each controller, and
+    # terminate the project
     proj, cart = _make(initial_angle, real_time)
     if real_time:
         _stall(proj)
-    data = _sim_loop(proj, cart, controller, time, real_time)
+    data = [_sim_loop(proj, cart, controller, time, real_time,
+                      controller_style, dtype) for controller in controllers]
     proj.terminate()
+
+    # Convert to data frames only if requested so that pandas is not
+    # required otherwise
+    if as_dataframe:
+        import pandas as pd
+        cols = ('time', 'angle', 'angle_integral', 'angular_rate', 'wheel',
+                'wheel_integral', 'wheel_rate', 'torque')
+        data = [pd.DataFrame(d, columns=cols) for d in data]
     return data
@@ -8,6 +8,7 @@ project, we use a double axis CMG to steer a spacecraft.
 SPDX-License-Identifier: GPL-3.0-only
 """
 
+import math
 from time import sleep
 from time import time as now
 from collections import deque
@@ -130,38 +131,38 @@ def _get_des(program_number, sim_time):
 
     # Step programs
     if program_number==1:
-        des = 10.0*np.pi/180.0 if sim_time > 2.0 else 0.0
+        des = 10.0*math.pi/180.0 if sim_time > 2.0 else 0.0
     elif program_number==2:
-        des = -15.0*np.pi/180.0 if sim_time > 2.0 else 0.0
+        des = -15.0*math.pi/180.0 if sim_time > 2.0 else 0.0
     elif program_number==3:
-        des = 30.0*np.pi/180.0 if sim_time > 2.0 else 0.0
+        des = 30.0*math.pi/180.0 if sim_time > 2.0 else 0.0
 
     # Sequential step programs
     elif program_number==4:
-        des = (min(sim_time,60.0)//5.0) * 5.0*np.pi/180.0
+        des = (min(sim_time,60.0)//5.0) * 5.0*math.pi/180.0
     elif program_number==5:
-        des = -(min(sim_time,60.0)//5.0) * 10.0*np.pi/180.0
+        des = -(min(sim_time,60.0)//5.0) * 10.0*math.pi/180.0
     elif program_number==6:
-        des = (min(sim_time,60.0)//5.0) * 15.0*np.pi/180.0
+        des = (min(sim_time,60.0)//5.0) * 15.0*math.pi/180.0
 
     # Linear programs
     elif program_number==7:
-        des = -sim_time*1.0*np.pi/180.0
+        des = -sim_time*1.0*math.pi/180.0
     elif program_number==8:
-        des = sim_time*2.0*np.pi/180.0
+        des = sim_time*2.0*math.pi/180.0
     elif program_number==9:
-        des = -sim_time*4.0*np.pi/180.0
+        des = -sim_time*4.0*math.pi/180.0
 
     # Sinusoidal programs
     elif program_number==10:
-        des = 10.0*np.pi/180.0*np.sin(np.pi*sim_time/(2.0*10.0))
+        des = 10.0*math.pi/180.0*math.sin(math.pi*sim_time/(2.0*10.0))
     elif program_number==11:
-        des = -15.0*np.pi/180.0*np.sin(np.pi*sim_time/(2.0*10.0))
+        des = -15.0*math.pi/180.0*math.sin(math.pi*sim_time/(2.0*10.0))
     elif program_number==12:
-        des = 30.0*np.pi/180.0*np.sin(np.pi*sim_time/(2.0*10.0))
+        des = 30.0*math.pi/180.0*math.sin(math.pi*sim_time/(2.0*10.0))
 
     # Unrecognized program
-    des = max(min(des, 0.4*np.pi), -0.4*np.pi)
+    des = max(min(des, 0.4*math.pi), -0.4*math.pi)
     return des
 
 def _sim_loop(proj, cmg, program, get_torque, time, real_time):
@@ -180,6 +181,9 @@ def _sim_loop(proj, cmg, program, get_torque, time, real_time):
     # Run a simulation loop
     start = now()
     earth_pitch = 0.0
+    earth_rate = (math.pi*2)/(2*3600)*proj.simulator.dt
+    planet_pitch = -math.radians(13)
+    planet_roll = math.radians(28.47)
     while proj.simtime <= time:
         # Get the state of the system
         state = _state(cmg)
@@ -193,11 +197,11 @@ def _sim_loop(proj, cmg, program, get_torque, time, real_time):
 
         # Apply the controller
         cmg.joints['S_to_A'].apply_torque(torque,
-                                          draw_arrow=True,
+                                          draw_arrow=real_time,
                                           arrow_scale=150,
                                           arrow_offset=0.7,)
         cmg.joints['S_to_B'].apply_torque(-torque,
-                                          draw_arrow=True,
+                                          draw_arrow=real_time,
                                           arrow_scale=150,
                                           arrow_offset=0.7,)
 
@@ -213,17 +217,17 @@ def _sim_loop(proj, cmg, program, get_torque, time, real_time):
 
         # Move the earth to simulate an orbit
         if real_time:
-            earth_pitch -= (np.pi*2)/(2*3600)*proj.simulator.dt
-            earth_x = np.array((np.sin(earth_pitch)*1.02*R_EARTH,
-                                0.0,
-                                -np.cos(earth_pitch)*1.02*R_EARTH,))
+            earth_pitch -= earth_rate
+            earth_x = (math.sin(earth_pitch)*1.02*R_EARTH,
+                       0.0,
+                       -math.cos(earth_pitch)*1.02*R_EARTH,)
             proj.visualizer.set_transform('planet',
-                                          pitch=-np.deg2rad(13),
-                                          roll=np.deg2rad(28.47),
+                                          pitch=planet_pitch,
+                                          roll=planet_roll,
                                           position=earth_x)
-            proj.visualizer.set_ptlight_1(position=(np.sin(earth_pitch)*12,
+            proj.visualizer.set_ptlight_1(position=(math.sin(earth_pitch)*12,
                                                     0.0,
-                                                    -np.cos(earth_pitch)*12))
+                                                    -math.cos(earth_pitch)*12))
 
         # Take a simulation step
         proj.step(real_time=real_time)
@@ -9,6 +9,7 @@ SPDX-License-Identifier: GPL-3.0-only
 """
 
 from time import sleep
+from collections import deque
 from condynsate import Project
 from condynsate import __assets__ as assets
 import numpy as np
@@ -73,12 +74,12 @@ def _sim_loop(proj, cmg, get_torque, time, real_time):
     proj.reset()
 
     # Make structure to hold simulation data
-    data = {'time':np.array([]),
-            'omega_alpha':np.array([]),
-            'omega_beta':np.array([]),
-            'alpha':np.array([]),
-            'beta':np.array([]),
-            'tau_beta':np.array([]),}
+    data = {'time':deque(),
+            'omega_alpha':deque(),
+            'omega_beta':deque(),
+            'alpha':deque(),
+            'beta':deque(),
+            'tau_beta':deque(),}
 
     # Run a simulation loop
     while proj.simtime <= time:
@@ -87,26 +88,28 @@ def _sim_loop(proj, cmg, get_torque, time, real_time):
 
         # Get the controller torque
         torque = get_torque(state)
-        torque = np.clip(torque, -0.0025, 0.0025)
+        torque = max(min(torque, 0.0025), -0.0025)
 
         # Apply the controller
         cmg.joints['A_to_B'].apply_torque(torque,
-                                          draw_arrow=True,
+                                          draw_arrow=real_time,
                                           arrow_scale=600,
                                           arrow_offset=0.8,)
 
         # Update the data
-        data['time'] = np.append(data['time'], proj.simtime)
-        data['omega_alpha']=np.append(data['omega_alpha'],state['omega_alpha'])
-        data['omega_beta'] = np.append(data['omega_beta'], state['omega_beta'])
-        data['alpha'] = np.append(data['alpha'], state['alpha'])
-        data['beta'] = np.append(data['beta'], state['beta'])
-        data['tau_beta'] = np.append(data['tau_beta'], torque)
+        data['time'].append(proj.simtime)
+        data['omega_alpha'].append(state['omega_alpha'])
+        data['omega_beta'].append(state['omega_beta'])
+        data['alpha'].append(state['alpha'])
+        data['beta'].append(state['beta'])
+        data['tau_beta'].append(torque)
 
         # Take a simulation step
         proj.step(real_time=real_time, stable_step=False)
 
     # Return the collected data
+    for key, value in data.items():
+        data[key] = np.array(value)
     return data
 
 def run(initial_angle, controller,
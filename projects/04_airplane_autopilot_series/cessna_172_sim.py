@@ -322,18 +322,13 @@ def _update_vis_env(proj, plane, telem, shake, chase, cam_target_history):
                                   position=(0,0,-R_PLANET-telem['h']))
 
 def _get_keypresses(proj):
-    delta_e = 0.0
-    delta_e -= 0.5*0.489 * float(proj.keyboard.is_pressed('i'))
-    delta_e += 0.5*0.489 * float(proj.keyboard.is_pressed('k'))
-
-    delta_r = 0.0
-    delta_r -= 0.5*0.279 * float(proj.keyboard.is_pressed('a'))
-    delta_r += 0.5*0.279 * float(proj.keyboard.is_pressed('d'))
-
-    delta_a = 0.0
-    delta_a -= 0.5*0.349 * float(proj.keyboard.is_pressed('j'))
-    delta_a += 0.5*0.349 * float(proj.keyboard.is_pressed('l'))
-
+    # Read all of the control keys at once
+    keys = ('i', 'k', 'a', 'd', 'j', 'l')
+    (elev_neg, elev_pos, rud_neg,
+     rud_pos, ail_neg, ail_pos) = proj.keyboard.are_pressed(keys)
+    delta_e = 0.5*0.489 * (elev_pos - elev_neg)
+    delta_r = 0.5*0.279 * (rud_pos - rud_neg)
+    delta_a = 0.5*0.349 * (ail_pos - ail_neg)
     return delta_e, delta_r, delta_a
 
 def _sim_loop(controller, program_num, proj, plane, flightsim, **kwargs):
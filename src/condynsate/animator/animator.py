@@ -13,14 +13,55 @@ SPDX-License-Identifier: GPL-3.0-only
 ###############################################################################
 from warnings import warn
 from copy import copy
-from compression import zstd
+import time
+import math
+from dataclasses import dataclass
+from queue import (Queue, Full)
+from threading import Thread
 import tkinter as tk
-import cv2
 import numpy as np
 from PIL import Image, ImageTk
-from condynsate.misc import save_recording
+from condynsate.misc import VideoStream
 from condynsate.animator.figure import Figure
 from condynsate.animator.subplots import (Lineplot, Barchart)
+POLL_DELTA = 0.01
+MAX_QUEUED_FRAMES = 60
+INT_TYPES = (int, np.integer)
+FLOAT_TYPES = (float, np.floating)
+
+###############################################################################
+#PLOT DATA CLASS
+###############################################################################
+@dataclass
+class _PlotData():
+    """
+    Stores the information needed to build and access one subplot.
+
+    Attributes
+    ----------
+    subplot_ind : int
+        The index of the subplot in the figure.
+    artist_inds : list of ints
+        The indices of each artist on the subplot.
+    type : string
+        Either 'Lineplot' or 'Barchart'.
+    n_artists : int
+        The number of artists on the subplot.
+    threaded : bool
+        Whether the subplot draws in a child thread.
+    kwargs : dict
+        The user set options of the subplot.
+    Subplot : condynsate.animator.subplots.Lineplot or Barchart or None
+        The subplot object. None until the animator is started.
+
+    """
+    subplot_ind : int
+    artist_inds : list
+    type : str
+    n_artists : int
+    threaded : bool
+    kwargs : dict
+    Subplot : object = None
 
 ###############################################################################
 #ANIMATOR CLASS
@@ -41,9 +82,13 @@ class Animator():
     record : bool, optional
         A boolean flag that indicates if the animator should be recorded. If
         True, all frames from the start function call to the terminate function
-        call are recorded. After the terminate function call, these frames are
-        saved with h.264 and outputs in an MP4 container. The saved file name
-        has the form animator_video.mp4
+        call are recorded. Frames are encoded as they are recorded (with h.264
+        when ffmpeg is available) and the video is finished by the terminate
+        function call. The saved file name has the form animator.mp4
+    record_scale : float, optional
+        The height of the recorded video as a fraction of 1080p. Must be a
+        positive, finite number. Values less than 1 make smaller videos
+        that are faster to encode. The default is 1.0.
 
     Attributes
     ----------
@@ -55,7 +100,7 @@ class Animator():
         A boolean flag that indicates if the animator is running or not.
 
     """
-    def __init__(self, frame_rate=20, record=False):
+    def __init__(self, frame_rate=20, record=False, record_scale=1.0):
         """
         Constructor func.
         """
@@ -64,11 +109,19 @@ class Animator():
             self.frame_delta = 1.0 / frame_rate
         else:
             self.frame_delta = 0.0
+        self._frame_delta_ns = int(self.frame_delta * 1e9)
+        self._poll_delta_ns = int(POLL_DELTA * 1e9)
 
         # Recording support
         self.record = record
-        self._frames = []
-        self._frame_ticks = []
+        if not self._is_number(record_scale) or record_scale <= 0:
+            m = "record_scale must be a positive number. Using 1.0."
+            warn(m, UserWarning)
+            record_scale = 1.0
+        self._record_height = int(1080 * record_scale)
+        self._video = None
+        self._record_q = None
+        self._record_thread = None
 
         # Track the number of subplots
         self._n_plots = 0
@@ -78,12 +131,18 @@ class Animator():
         self._figure = None
         self._plots = []
         self._started = False
-        self._last_refresh = cv2.getTickCount()
+        self._last_refresh = time.monotonic_ns()
+        self._last_poll = self._last_refresh
+
+        # Lookup tables from artist ids to their subplot and artist index
+        self._bars = {}
+        self._lines = {}
 
         # GUI support
         self._root = tk.Tk()
         self._root.title("condynsate Animator")
         self._panel = None
+        self._drawn_image = None
 
     def __del__(self):
         """
@@ -194,18 +253,17 @@ class Animator():
 
         # Add an empty lineplot to the plot data list
         self._n_plots += 1
-        plot_data = {'subplot_ind' : self._n_plots - 1,
-                     'artist_inds' : np.arange(n_lines).tolist(),
-                     'type' : 'Lineplot',
-                     'n_artists' : n_lines,
-                     'threaded' : self._THREADED,
-                     'kwargs' : kwargs,
-                     'Subplot' : None,}
+        plot_data = _PlotData(subplot_ind=self._n_plots - 1,
+                              artist_inds=list(range(n_lines)),
+                              type='Lineplot',
+                              n_artists=n_lines,
+                              threaded=self._THREADED,
+                              kwargs=kwargs)
         self._plots.append(plot_data)
 
         # Return line artist ids that identify line and subplot
-        lines_ids = tuple(hex(16 * plot_data['subplot_ind'] + a_ind)
-                          for a_ind in plot_data['artist_inds'])
+        base = plot_data.subplot_ind << 4
+        lines_ids = tuple(hex(base | a_ind) for a_ind in plot_data.artist_inds)
         if len(lines_ids) == 1:
             lines_ids = lines_ids[0]
         return lines_ids
@@ -282,18 +340,17 @@ class Animator():
 
         # Add an empty barchart to the plot data list
         self._n_plots += 1
-        plot_data = {'subplot_ind' : self._n_plots - 1,
-                     'artist_inds' : np.arange(n_bars).tolist(),
-                     'type' : 'Barchart',
-                     'n_artists' : n_bars,
-                     'threaded' : self._THREADED,
-                     'kwargs' : kwargs,
-                     'Subplot' : None,}
+        plot_data = _PlotData(subplot_ind=self._n_plots - 1,
+                              artist_inds=list(range(n_bars)),
+                              type='Barchart',
+                              n_artists=n_bars,
+                              threaded=self._THREADED,
+                              kwargs=kwargs)
         self._plots.append(plot_data)
 
         # Return line artist ids that identify line and subplot
-        bar_ids = tuple(hex(16 * plot_data['subplot_ind'] + a_ind)
-                        for a_ind in plot_data['artist_inds'])
+        base = plot_data.subplot_ind << 4
+        bar_ids = tuple(hex(base | a_ind) for a_ind in plot_data.artist_inds)
         if len(bar_ids) == 1:
             bar_ids = bar_ids[0]
         return bar_ids
@@ -330,36 +387,70 @@ class Animator():
             raise RuntimeError(err) from e
 
         try:
-            # Make each subplot
+            # Make each subplot on its axes
+            axes_list = self._figure.get_axes()
+            fig_lock = self._figure.get_lock()
             for subplot_ind, subplot in enumerate(self._plots):
+                axes = axes_list[subplot_ind]
 
                 # Make a lineplot
-                if (subplot['type']).lower() == 'lineplot':
-                    self._make_lineplot(subplot_ind)
+                if subplot.type == 'Lineplot':
+                    self._make_lineplot(subplot_ind, axes, fig_lock)
 
                 # Make a barchart
-                elif (subplot['type']).lower() == 'barchart':
-                    self._make_barchart(subplot_ind)
+                elif subplot.type == 'Barchart':
+                    self._make_barchart(subplot_ind, axes, fig_lock)
 
         except Exception as e:
             self.terminate()
             err = "Something went wrong while building the subplots."
             raise RuntimeError(err) from e
 
+        # Build the artist id lookup tables
+        for subplot_ind, subplot in enumerate(self._plots):
+            if isinstance(subplot.Subplot, Lineplot):
+                artists = self._lines
+            else:
+                artists = self._bars
+            base = subplot_ind << 4
+            for artist_ind in subplot.artist_inds:
+                artists[hex(base | artist_ind)] = (subplot.Subplot, artist_ind)
+
+
+        # Start the thread that encodes recorded frames
+        if self.record:
+            fps = 1.0/self.frame_delta if self.frame_delta > 0.0 else 120.0
+            self._video = VideoStream('animator', fps,
+                                      height=self._record_height)
+            self._record_q = Queue(maxsize=MAX_QUEUED_FRAMES)
+            self._record_thread = Thread(target=self._record_loop,
+                                         daemon=True)
+            self._record_thread.start()
 
         # Indicate that threads are running
         self._started = True
 
-        # Open the viewing window
+        # Open the viewing window. The first figure image is drawn right
+        # away so that the window is sized to the figure once, and the
+        # photo image is then reused for every following frame.
         self._panel = tk.Label(self._root)
+        self._panel.image = None
+        image = self._figure.get_image()
+        self._draw_image(image)
+        self._drawn_image = image
         self._panel.pack(side="bottom", fill="both", expand="yes")
+        self._root.resizable(False, False)
         self.refresh()
         return 0
 
     def refresh(self):
         """
         Updates the animator GUI with the most recently drawn figure. Must
-        be called regularly to maintain responsivness of GUI.
+        be called regularly to maintain responsivness of GUI. All data
+        setting functions call refresh, so calling it directly is only
+        needed when no data is being set. Between frames, a call only reads
+        the clock and, at most once every POLL_DELTA seconds, polls GUI
+        events.
 
         Returns
         -------
@@ -368,32 +459,92 @@ class Animator():
 
 
         """
-        # Get elapsed time since refresh
-        dt = (cv2.getTickCount() - self._last_refresh)/cv2.getTickFrequency()
+        # Get elapsed time, in nanoseconds, since refresh
+        now = time.monotonic_ns()
 
         # If not enough time has passed, only refresh the responsiveness.
-        if dt < self.frame_delta:
-            self._root.update_idletasks()
-            self._root.update()
+        # GUI events are polled at most once every POLL_DELTA seconds so that
+        # frequent data updates are not serialized against the GUI loop.
+        if now - self._last_refresh < self._frame_delta_ns:
+            if now - self._last_poll >= self._poll_delta_ns:
+                self._root.update()
+                self._last_poll = now
             return 0
 
-        # Get the current image, draw it to screen, update last frame time
+        # Get the current image, draw it to screen if it is new and the
+        # window is visible (not minimized), update last frame time
         image = self._figure.get_image()
-        if not self._panel is None:
-            imagetk = ImageTk.PhotoImage(Image.fromarray(image))
-            self._panel.configure(image=imagetk)
-            self._panel.image = imagetk
-        self._root.update_idletasks()
+        if (not self._panel is None and not image is self._drawn_image and
+            self._panel.winfo_viewable()):
+            self._draw_image(image)
+            self._drawn_image = image
         self._root.update()
-        self._last_refresh = cv2.getTickCount()
-
-        # If recording, save the current image
-        if self.record:
-            self._frames.append((zstd.compress(image, level=1), image.shape))
-            self._frame_ticks.append(self._last_refresh)
+        self._last_refresh = time.monotonic_ns()
+        self._last_poll = self._last_refresh
+
+        # If recording, send the current image to be encoded. The figure
+        # never modifies a published image, so no copy is needed. If the
+        # encoder has fallen too far behind, the frame is dropped and the
+        # previous frame is held in the video instead
+        if not self._record_q is None:
+            try:
+                self._record_q.put_nowait((image, self._last_refresh))
+            except Full:
+                pass
 
         return 0
 
+    def _draw_image(self, image):
+        """
+        Draws an image to the panel. The panel's Tk photo image is reused
+        and updated in place whenever the image size is unchanged.
+
+        Parameters
+        ----------
+        image : m x n x 3 numpy array of dtype np.uint8
+            The RGB image being drawn.
+
+        Returns
+        -------
+        None.
+
+        """
+        pil_image = Image.fromarray(image)
+
+        # Update the current photo image in place if it is the right size
+        imagetk = self._panel.image
+        if not imagetk is None:
+            if (imagetk.width(), imagetk.height()) == pil_image.size:
+                imagetk.paste(pil_image)
+                return
+
+        # Otherwise make a new photo image
+        imagetk = ImageTk.PhotoImage(pil_image)
+        self._panel.configure(image=imagetk)
+        self._panel.image = imagetk
+
+    def _record_loop(self):
+        """
+        Streams recorded frames to the video until a None frame is received.
+        Runs in its own thread so that encoding is kept off of the GUI loop.
+        If a frame fails to encode, later frames are drained but not written.
+
+        Returns
+        -------
+        None.
+
+        """
+        failed = False
+        while True:
+            frame = self._record_q.get()
+            if frame is None:
+                self._record_q.task_done()
+                return
+            if not failed:
+                image, time_ns = frame
+                failed = self._video.write(image, time_ns * 1e-9) < 0
+            self._record_q.task_done()
+
     def barchart_set_value(self, bar_id, value):
         """
         Set's a bar's value.
@@ -416,7 +567,8 @@ class Animator():
             m="barchart_set_value failed because animator not started."
             warn(m, UserWarning)
             return -1
-        if not self._sanitize_barchart(bar_id):
+        bar = self._get_bar(bar_id)
+        if bar is None:
             m="barchart_set_value failed because bar_id is invalid."
             warn(m, UserWarning)
             return -1
@@ -425,12 +577,69 @@ class Animator():
             warn(m, UserWarning)
             return -1
 
-        # Extract the subplot_ind and bar_ind from the bar_id
-        subplot_ind = int(bar_id, 16)//16
-        bar_ind = int(bar_id, 16) % 16
-
         # Set value
-        self._plots[subplot_ind]['Subplot'].set_value(value, bar_ind)
+        subplot, bar_ind = bar
+        subplot.set_value(value, bar_ind)
+
+        # Refresh the viewer
+        self.refresh()
+        return 0
+
+    def barchart_set_values(self, bar_ids, values):
+        """
+        Set's multiple bars' values at once. This is equivalent to, but
+        faster than, calling barchart_set_value once for each bar. The bars
+        may belong to different bar charts.
+
+        Parameters
+        ----------
+        bar_ids : list of hex strings
+            The ids of the bars whose values are being set.
+        values : list of floats
+            The values to which the bars are set. Must be the same length as
+            bar_ids.
+
+        Returns
+        -------
+        ret_code : int
+            0 if successful, -1 if something went wrong.
+
+        """
+        # Sanitization
+        if not self._started:
+            m="barchart_set_values failed because animator not started."
+            warn(m, UserWarning)
+            return -1
+        if not isinstance(bar_ids, (list, tuple)):
+            m="barchart_set_values failed because bar_ids is invalid."
+            warn(m, UserWarning)
+            return -1
+        bars = [self._get_bar(bar_id) for bar_id in bar_ids]
+        if any(bar is None for bar in bars):
+            m="barchart_set_values failed because a bar_id is invalid."
+            warn(m, UserWarning)
+            return -1
+        if not self._is_number_list(values):
+            m="barchart_set_values failed because values is invalid."
+            warn(m, UserWarning)
+            return -1
+        if len(bar_ids) != len(values):
+            m="barchart_set_values failed because bar_ids and values are "
+            m+="not the same length."
+            warn(m, UserWarning)
+            return -1
+
+        # Group the bar_inds and values by the subplot they belong to
+        updates = {}
+        for (subplot, bar_ind), value in zip(bars, values):
+            if not subplot in updates:
+                updates[subplot] = ([], [])
+            updates[subplot][0].append(value)
+            updates[subplot][1].append(bar_ind)
+
+        # Set the values of each subplot at once
+        for subplot, (vals, bar_inds) in updates.items():
+            subplot.set_values(vals, bar_inds)
 
         # Refresh the viewer
         self.refresh()
@@ -460,7 +669,12 @@ class Animator():
             m="lineplot_append_point failed because animator not started."
             warn(m, UserWarning)
             return -1
-        if not self._sanitize_lineplot(line_id):
+        try:
+            # Valid ids are found with a single dict lookup
+            line = self._lines[line_id]
+        except (KeyError, TypeError):
+            line = self._get_line(line_id)
+        if line is None:
             m="lineplot_append_point failed because line_id is invalid."
             warn(m, UserWarning)
             return -1
@@ -473,12 +687,64 @@ class Animator():
             warn(m, UserWarning)
             return -1
 
-        # Extract the subplot_ind and line_ind from the line_id
-        subplot_ind = int(line_id, 16)//16
-        line_ind = int(line_id, 16) % 16
-
         # Append point
-        self._plots[subplot_ind]['Subplot'].append_point(x_val,y_val,line_ind)
+        subplot, line_ind = line
+        subplot.append_point(x_val, y_val, line_ind)
+
+        # Refresh the viewer
+        self.refresh()
+        return 0
+
+    def lineplot_append_points(self, line_id, x_vals, y_vals):
+        """
+        Appends a batch of y versus x data points to the end of a line. This
+        is equivalent to, but faster than, calling lineplot_append_point once
+        for each point.
+
+        Parameters
+        ----------
+        line_id : hex string
+            The id of the line to which the points are appended.
+        x_vals : list or numpy array of floats
+            The x coordinates of the data points being appended.
+        y_vals : list or numpy array of floats
+            The y coordinates of the data points being appended. Must be the
+            same length as x_vals. Pushing many points per call amortizes the
+            cost of refreshing the viewer over the whole batch.
+
+        Returns
+        -------
+        ret_code : int
+            0 if successful, -1 if something went wrong.
+
+        """
+        # Sanitization
+        if not self._started:
+            m="lineplot_append_points failed because animator not started."
+            warn(m, UserWarning)
+            return -1
+        line = self._get_line(line_id)
+        if line is None:
+            m="lineplot_append_points failed because line_id is invalid."
+            warn(m, UserWarning)
+            return -1
+        if not self._is_number_list(x_vals):
+            m="lineplot_append_points failed because x_vals is invalid."
+            warn(m, UserWarning)
+            return -1
+        if not self._is_number_list(y_vals):
+            m="lineplot_append_points failed because y_vals is invalid."
+            warn(m, UserWarning)
+            return -1
+        if len(x_vals) != len(y_vals):
+            m="lineplot_append_points failed because x_vals and y_vals "
+            m+="are not the same length."
+            warn(m, UserWarning)
+            return -1
+
+        # Append points
+        subplot, line_ind = line
+        subplot.append_points(x_vals, y_vals, line_ind)
 
         # Refresh the viewer
         self.refresh()
@@ -492,9 +758,9 @@ class Animator():
         ----------
         line_id : hex string
             The id of the line on which that data are plotted.
-        x_vals : list of floats
+        x_vals : list or numpy array of floats
             A list of x coordinates of the points being plotted.
-        y_vals : list of floats
+        y_vals : list or numpy array of floats
             A list of y coordinates of the points being plotted.
 
         Returns
@@ -508,7 +774,8 @@ class Animator():
             m="lineplot_set_data failed because animator not started."
             warn(m, UserWarning)
             return -1
-        if not self._sanitize_lineplot(line_id):
+        line = self._get_line(line_id)
+        if line is None:
             m="lineplot_set_data failed because line_id is invalid."
             warn(m, UserWarning)
             return -1
@@ -521,12 +788,9 @@ class Animator():
             warn(m, UserWarning)
             return -1
 
-        # Extract the subplot_ind and line_ind from the line_id
-        subplot_ind = int(line_id, 16)//16
-        line_ind = int(line_id, 16) % 16
-
         # Set data
-        self._plots[subplot_ind]['Subplot'].set_data(x_vals, y_vals, line_ind)
+        subplot, line_ind = line
+        subplot.set_data(x_vals, y_vals, line_ind)
 
         # Refresh the viewer
         self.refresh()
@@ -550,11 +814,12 @@ class Animator():
 
         # Reset all subplot data
         for subplot in self._plots:
-            subplot['Subplot'].reset_data()
+            subplot.Subplot.reset_data()
 
-        # Reset the recording data
-        self._frames = []
-        self._frame_ticks = []
+        # Discard the recording once all pending frames are encoded
+        if not self._record_q is None:
+            self._record_q.join()
+            self._video.discard()
 
         # Refresh the viewer
         self.refresh()
@@ -571,10 +836,18 @@ class Animator():
             0 if successful, -1 if something went wrong.
 
         """
+        # Attempt to stop every subplot's drawer thread before waiting for
+        # any of them so that they all shut down at the same time
+        for subplot in self._plots:
+            try:
+                subplot.Subplot.stop()
+            except Exception:
+                pass
+
         # Attempt to terminate each subplot
         for subplot in self._plots:
             try:
-                subplot['Subplot'].terminate()
+                subplot.Subplot.terminate()
             except Exception:
                 pass
 
@@ -589,25 +862,30 @@ class Animator():
             self._root.destroy()
             self._root = None
         self._panel = None
+        self._drawn_image = None
 
-        # Save recording
-        if self.record and len(self._frames) > 1:
+        # Finish encoding all recorded frames and save the recording
+        if not self._record_thread is None:
             print('Saving animator recording...')
-            # Convert frame ticks to frame times
-            frame_times = np.array(self._frame_ticks, dtype=float)
-            frame_times /= cv2.getTickFrequency()
-            frame_times -= frame_times[0]
-            save_recording(self._frames, frame_times, 'animator')
+            self._record_q.put(None)
+            self._record_thread.join()
+            ret_code = self._video.close()
+        else:
+            ret_code = 0
 
         # Reset locals
-        self._frames = []
-        self._frame_ticks = []
+        self._video = None
+        self._record_q = None
+        self._record_thread = None
         self._n_plots = 0
         self._figure = None
         self._plots = []
+        self._bars = {}
+        self._lines = {}
         self._started = False
-        self._last_refresh = cv2.getTickCount()
-        return 0
+        self._last_refresh = time.monotonic_ns()
+        self._last_poll = self._last_refresh
+        return ret_code
 
     def _assert_not_started(self):
         """
@@ -676,7 +954,7 @@ class Animator():
             err = "Cannot include more than 16 plots."
             raise RuntimeError(err)
 
-    def _make_lineplot(self, subplot_ind):
+    def _make_lineplot(self, subplot_ind, axes, fig_lock):
         """
         Creates and starts a Lineplot object.
 
@@ -684,6 +962,10 @@ class Animator():
         ----------
         subplot_ind : int
             The index of the lineplot being created.
+        axes : matplotlib.axes
+            The axes on which the lineplot lives.
+        fig_lock : _thread.lock
+            The mutex lock of the figure on which the axes are drawn.
 
         Returns
         -------
@@ -691,17 +973,14 @@ class Animator():
 
         """
         # Build the lineplot
-        axes = self._figure.get_axes()[subplot_ind]
-        fig_lock = self._figure.get_lock()
-        n_lines = self._plots[subplot_ind]['n_artists']
-        threaded = self._plots[subplot_ind]['threaded']
-        kwargs = self._plots[subplot_ind]['kwargs']
-        subplot = Lineplot(axes, fig_lock, n_lines, threaded, **kwargs)
+        plot_data = self._plots[subplot_ind]
+        subplot = Lineplot(axes, fig_lock, plot_data.n_artists,
+                           plot_data.threaded, **plot_data.kwargs)
 
         # Add the lineplot and figure to the plot data structure
-        self._plots[subplot_ind]['Subplot'] = subplot
+        plot_data.Subplot = subplot
 
-    def _make_barchart(self, subplot_ind):
+    def _make_barchart(self, subplot_ind, axes, fig_lock):
         """
         Creates and starts a barchart object.
 
@@ -709,6 +988,10 @@ class Animator():
         ----------
         subplot_ind : int
             The index of the barchart being created.
+        axes : matplotlib.axes
+            The axes on which the barchart lives.
+        fig_lock : _thread.lock
+            The mutex lock of the figure on which the axes are drawn.
 
         Returns
         -------
@@ -716,140 +999,12 @@ class Animator():
 
         """
         # Build the barchart
-        axes = self._figure.get_axes()[subplot_ind]
-        fig_lock = self._figure.get_lock()
-        n_bars = self._plots[subplot_ind]['n_artists']
-        threaded = self._plots[subplot_ind]['threaded']
-        kwargs = self._plots[subplot_ind]['kwargs']
-        subplot = Barchart(axes, fig_lock, n_bars, threaded, **kwargs)
+        plot_data = self._plots[subplot_ind]
+        subplot = Barchart(axes, fig_lock, plot_data.n_artists,
+                           plot_data.threaded, **plot_data.kwargs)
 
         # Add the barchart and figure to the plot data structure
-        self._plots[subplot_ind]['Subplot'] = subplot
-
-    def _is_valid_id(self, artist_id):
-        """
-        Ensures that a candidate artist_id is a valid hex string.
-
-        Parameters
-        ----------
-        artist_id : type
-            Candidate artist_id.
-
-        Returns
-        -------
-        bool
-            True if valid, false if invalid.
-
-        """
-        # Check the type
-        try:
-            artist_int = int(artist_id, 16)
-        except Exception:
-            return False
-
-        # Ensure between 0 and 255
-        if artist_int < 0 or artist_int > 255:
-            return False
-
-        # All conditions met, is valid artist_id
-        return True
-
-    def _is_subplot_ind(self, artist_id):
-        """
-        Checks that the artist id refers to a valid subplot.
-
-        Parameters
-        ----------
-        artist_id : hex string
-            id being inspected.
-
-        Returns
-        -------
-        bool
-            True if valid, false if invalid.
-
-        """
-        # Check the upper and lower bounds
-        artist_int = int(artist_id, 16)
-        subplot_ind = artist_int//16
-        lb_ok = subplot_ind >= 0
-        ub_ok = subplot_ind < len(self._plots)
-        if not lb_ok or not ub_ok:
-            return False
-
-        # Make sure the indexed subplot is type Subplot
-        sp_ok = type(self._plots[subplot_ind]['Subplot']).__module__
-        sp_ok = sp_ok == 'condynsate.animator.subplots'
-        if not sp_ok:
-            return False
-        return True
-
-    def _is_barchart(self, artist_id):
-        """
-        Checks that the artist id refers to a barchart.
-
-        Parameters
-        ----------
-        artist_id : hex string
-            id being inspected.
-
-        Returns
-        -------
-        bool
-            True if barchart, false else.
-
-        """
-        subplot_ind = int(artist_id, 16)//16
-        typ = self._plots[subplot_ind]['type']
-        if not typ.lower() == 'barchart':
-            return False
-        return True
-
-    def _is_lineplot(self, artist_id):
-        """
-        Checks that the artist id refers to a lineplot.
-
-        Parameters
-        ----------
-        artist_id : hex string
-            id being inspected.
-
-        Returns
-        -------
-        bool
-            True if lineplot, false else.
-
-        """
-        subplot_ind = int(artist_id, 16)//16
-        typ = self._plots[subplot_ind]['type']
-        if not typ.lower() == 'lineplot':
-            return False
-        return True
-
-    def _artist_ind_ok(self, artist_id):
-        """
-        Checks that the artist id refers to a valid artist.
-
-        Parameters
-        ----------
-        artist_id : hex string
-            id being inspected.
-
-        Returns
-        -------
-        bool
-            True if valid artist, false else.
-
-        """
-        subplot_ind = int(artist_id, 16)//16
-        artist_ind = int(artist_id, 16) % 16
-
-        # Check the upper and lower bounds
-        lb_ok = artist_ind >= 0
-        ub_ok = artist_ind < self._plots[subplot_ind]['n_artists']
-        if not lb_ok or not ub_ok:
-            return False
-        return True
+        plot_data.Subplot = subplot
 
     def _is_int(self, val):
         """
@@ -866,11 +1021,7 @@ class Animator():
             True if int, else false.
 
         """
-        ints = (np.int64, np.int32, np.int16, np.int8,
-                np.uint64, np.uint64, np.uint64, np.uint64, int, )
-        if isinstance(val, ints):
-            return True
-        return False
+        return isinstance(val, INT_TYPES)
 
     def _is_float(self, val):
         """
@@ -888,10 +1039,7 @@ class Animator():
             True if float, else false.
 
         """
-        floats = (np.float64, np.float32, np.float16, float, )
-        if isinstance(val, floats) and not np.isnan(val) and not np.isinf(val):
-            return True
-        return False
+        return isinstance(val, FLOAT_TYPES) and math.isfinite(val)
 
     def _is_number(self, val):
         """
@@ -910,9 +1058,9 @@ class Animator():
             True if number, else false.
 
         """
-        if self._is_int(val) or self._is_float(val):
+        if isinstance(val, INT_TYPES):
             return True
-        return False
+        return isinstance(val, FLOAT_TYPES) and math.isfinite(val)
 
     def _is_number_list(self, vals):
         """
@@ -932,20 +1080,66 @@ class Animator():
             True if list or array of numbers, else false.
 
         """
-        if isinstance(vals, (list, np.ndarray)):
-            for val in vals:
-                if not self._is_number(val):
-                    return False
-            return True
-        return False
+        if not isinstance(vals, (list, np.ndarray)):
+            return False
+
+        # Check the values all at once when they convert to a numeric array
+        try:
+            arr = np.asarray(vals)
+        except (ValueError, TypeError):
+            return False
+        if arr.ndim == 1:
+            kind = arr.dtype.kind
+            if kind in 'iu' or (kind == 'b' and isinstance(vals, list)):
+                return True
+            if kind == 'f':
+                return bool(np.isfinite(arr).all())
+            if kind != 'O':
+                return False
+
+        # Otherwise, fall back to checking each value
+        for val in vals:
+            if not self._is_number(val):
+                return False
+        return True
 
-    def _sanitize_barchart(self, bar_id):
+    def _get_artist(self, artists, artist_id):
         """
-        Checks if an artist id
-            0: is a valid id hex string between 0 and 255, and
-            1: refers to a subplot that exists, and
-            2: refers to a subplot that is a barchart, and
-            3: refers to an artist that exists.
+        Looks up the subplot and artist index that an artist id refers to.
+
+        Parameters
+        ----------
+        artists : dict
+            The artist lookup table being searched. Either self._bars or
+            self._lines.
+        artist_id : hex string
+            The candidate artist id.
+
+        Returns
+        -------
+        artist : tuple of (condynsate.animator.subplots.Subplot, int) or None
+            The subplot that the artist belongs to and the index of the artist
+            in that subplot. None if artist_id does not refer to an artist
+            in the lookup table.
+
+        """
+        try:
+            return artists[artist_id]
+        except KeyError:
+            pass
+        except TypeError:
+            return None
+
+        # Equivalent hex strings (for example '0XA' or '0x0a') also refer
+        # to the artist
+        try:
+            return artists.get(hex(int(artist_id, 16)), None)
+        except (TypeError, ValueError):
+            return None
+
+    def _get_bar(self, bar_id):
+        """
+        Looks up the barchart and bar index that a bar id refers to.
 
         Parameters
         ----------
@@ -954,24 +1148,16 @@ class Animator():
 
         Returns
         -------
-        bool
-            True if all conditions are met, else false.
+        bar : tuple of (condynsate.animator.subplots.Barchart, int) or None
+            The barchart and the index of the bar in the barchart. None if
+            bar_id does not refer to a bar.
 
         """
-        if not self._is_valid_id(bar_id):
-            return False
-        cond_1 =  self._is_subplot_ind(bar_id)
-        cond_2 = self._is_barchart(bar_id)
-        cond_3 = self._artist_ind_ok(bar_id)
-        return cond_1 and cond_2 and cond_3
+        return self._get_artist(self._bars, bar_id)
 
-    def _sanitize_lineplot(self, line_id):
+    def _get_line(self, line_id):
         """
-        Checks if an artist id
-            0: is a valid id hex string between 0 and 255, and
-            1: refers to a subplot that exists, and
-            2: refers to a subplot that is a lineplot, and
-            3: refers to an artist that exists.
+        Looks up the lineplot and line index that a line id refers to.
 
         Parameters
         ----------
@@ -980,13 +1166,9 @@ class Animator():
 
         Returns
         -------
-        bool
-            True if all conditions are met, else false.
+        line : tuple of (condynsate.animator.subplots.Lineplot, int) or None
+            The lineplot and the index of the line in the lineplot. None if
+            line_id does not refer to a line.
 
         """
-        if not self._is_valid_id(line_id):
-            return False
-        cond_1 =  self._is_subplot_ind(line_id)
-        cond_2 = self._is_lineplot(line_id)
-        cond_3 = self._artist_ind_ok(line_id)
-        return cond_1 and cond_2 and cond_3
+        return self._get_artist(self._lines, line_id)
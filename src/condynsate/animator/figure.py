@@ -12,7 +12,6 @@ SPDX-License-Identifier: GPL-3.0-only
 #DEPENDENCIES
 ###############################################################################
 import time
-from copy import deepcopy as copy
 from threading import (Thread, Lock)
 import numpy as np
 import matplotlib
@@ -37,15 +36,19 @@ class Figure():
         THREADED FLAG IS SET TO TRUE. The default is False.
     """
     def __init__(self, n, threaded=False):
-        # Make a lock for the figure
+        # Make a lock for the figure and a lock for the latest image of the
+        # figure. Reading the image never waits for the figure to be drawn.
         self._LOCK = Lock()
+        self._IMG_LOCK = Lock()
 
         # Get the figure shape and make it and its axes
         self.shape = self._get_shape(n)
         self._fig, self._axes_list = self._make()
 
-        # Draw the current figure
+        # Draw the current figure. The backgrounds of each axes are cached
+        # so that animated artists can be blitted on top of them.
         self._img = None
+        self._bgs = None
         self.redraw()
 
         # Start the drawing thread
@@ -201,7 +204,11 @@ class Figure():
     def redraw(self):
         """
         Redraws the figure to self._img. Thread safe self._fig and self._img
-        read and write.
+        read and write. The full figure is only drawn when something other
+        than an animated artist has changed, otherwise the cached axes
+        backgrounds are restored and only the animated artists are blitted
+        on top of them. When nothing has changed since the last draw, the
+        previously published image is kept and nothing is drawn.
 
         Returns
         -------
@@ -210,49 +217,72 @@ class Figure():
         """
         # Aquire mutex lock to interact with figure and self._img
         with self._LOCK:
-            self._fig.canvas.draw() # Draw on the canvas
-
-            # Get the shape of the canvas image
-            img_shape = self._fig.canvas.get_width_height()
-            img_shape = (img_shape[1], img_shape[0], 4)
-
-            # Aquire the img on the canvas
-            img_buf = self._fig.canvas.tostring_argb()
-            img = np.frombuffer(img_buf, dtype=np.uint8)
-            img = img.reshape(img_shape)[:,:,1:]
-
-            # Make a copy of the canvas image
-            self._img = img.copy()
-
+            canvas = self._fig.canvas
+            animated = [artist for axes in self._axes_list
+                        for artist in axes.get_children()
+                        if artist.get_animated()]
+
+            # Changes to animated artists only mark the artists themselves
+            # as stale. If nothing is stale, the published image is current.
+            if not (self._bgs is None or self._fig.stale or
+                    any(artist.stale for artist in animated)):
+                return
+
+            # Changes to animated artists do not mark the figure as stale,
+            # so a stale figure means the backgrounds must be redrawn.
+            if self._bgs is None or self._fig.stale:
+                canvas.draw()
+                self._bgs = [canvas.copy_from_bbox(a.bbox)
+                             for a in self._axes_list]
+            else:
+                for bg in self._bgs:
+                    canvas.restore_region(bg)
+
+            # Blit the animated artists on top of the backgrounds
+            for artist in animated:
+                artist.axes.draw_artist(artist)
+                artist.stale = False
+
+            # View the RGBA canvas buffer without copying it
+            buf = np.asarray(canvas.buffer_rgba())
+            height, width = buf.shape[0], buf.shape[1]
+
+            # Copy the RGB channels of the canvas image in a single pass.
             # Make sure the image has height and width divisible by 2 for
-            # h264 codex (will be implemented later). This is done by adding
-            # an extra white row and/or column if needed
-            if img_shape[0]%2 != 0:
-                extra_row = 255*np.ones((1, img_shape[1], 3), dtype=np.uint8)
-                self._img = np.concatenate((self._img, extra_row), axis=0)
-            if img_shape[1]%2 != 0:
-                extra_col = 255*np.ones((img_shape[0], 1, 3), dtype=np.uint8)
-                self._img = np.concatenate((self._img, extra_col), axis=1)
+            # h264 codex. This is done by adding an extra white row and/or
+            # column if needed
+            if height%2 == 0 and width%2 == 0:
+                img = buf[:, :, :3].copy()
+            else:
+                img_shape = (height + height%2, width + width%2, 3)
+                img = np.full(img_shape, 255, dtype=np.uint8)
+                img[:height, :width] = buf[:, :, :3]
+
+        # Publish the new image. Published images are never modified.
+        with self._IMG_LOCK:
+            self._img = img
 
     def get_image(self):
         """
-        Gets the current figure image.
+        Gets the most recently drawn figure image. Does not wait for the
+        figure to finish drawing if it is currently being drawn.
 
         Returns
         -------
         image : numpy array (H, W, 3)
-            The current (R,G,B) figure canvas image.
+            The current (R,G,B) figure canvas image. Must not be modified.
 
         """
-        # Aquire lock to copy image
-        with self._LOCK:
-            image = copy(self._img)
+        # Aquire lock to read the latest published image
+        with self._IMG_LOCK:
+            image = self._img
         return image
 
     def terminate(self):
         """
-        Terminate the drawer thread (if it exists). MAKE SURE TO CALL THIS
-        WHEN DONE IF THREADED FLAG IS SET TO TRUE.
+        Terminate the drawer thread (if it exists) and close the matplotlib
+        figure. MAKE SURE TO CALL THIS WHEN DONE IF THREADED FLAG IS SET TO
+        TRUE.
 
         Returns
         -------
@@ -263,3 +293,7 @@ class Figure():
             with self._LOCK:
                 self._done = True
             self._thread.join()
+
+        # Close the figure so pyplot does not keep a reference to it
+        plt.close(self._fig)
+        self._bgs = None
@@ -16,6 +16,7 @@ import sys
 import time
 from warnings import warn
 from copy import copy
+from collections import deque
 from threading import (Thread, Lock)
 import numpy as np
 FONT_SIZE = 7
@@ -80,9 +81,10 @@ class _Subplot():
         # Create a structure for the data
         self.data = {}
         
-        # Create a structures needed for blitting
+        # The extents last applied to the axes. The axes limits are only set
+        # when they change because setting them forces the figure to fully
+        # redraw instead of blitting the artists.
         self._extents = ((None, None), (None, None))
-        self.update_bg = False
 
         # The redraw flag tells when something on the axes has been
         # updated and therefore the axes must be redrawn
@@ -359,9 +361,11 @@ class _Subplot():
         upper = self._get_u_extent(self.options['axes']['x_lim'][1], x_range)
         x_extents = (lower, upper)
 
-        # Aquire mutex lock to set figure axes' extents
-        with self._FIG_LOCK:
-            self._axes.set_xlim(x_extents[0], x_extents[1])
+        # Aquire mutex lock to set figure axes' extents if they changed
+        if x_extents != self._extents[0]:
+            with self._FIG_LOCK:
+                self._axes.set_xlim(x_extents[0], x_extents[1])
+            self._extents = (x_extents, self._extents[1])
         return x_extents
 
     def _update_y_extent(self, y_range = (None, None)):
@@ -385,9 +389,11 @@ class _Subplot():
         upper = self._get_u_extent(self.options['axes']['y_lim'][1], y_range)
         y_extents = (lower, upper)
 
-        # Aquire mutex lock to set figure axes' extents
-        with self._FIG_LOCK:
-            self._axes.set_ylim(y_extents[0], y_extents[1])
+        # Aquire mutex lock to set figure axes' extents if they changed
+        if y_extents != self._extents[1]:
+            with self._FIG_LOCK:
+                self._axes.set_ylim(y_extents[0], y_extents[1])
+            self._extents = (self._extents[0], y_extents)
         return y_extents
 
     def redraw(self):
@@ -442,10 +448,11 @@ class _Subplot():
             self._thread.daemon = True
             self._thread.start()
 
-    def terminate(self):
+    def stop(self):
         """
-        Terminate the drawer thread (if it exists). MAKE SURE TO CALL THIS
-        WHEN DONE IF THREADED FLAG IS SET TO TRUE.
+        Tells the drawer thread (if it exists) to stop without waiting for
+        it to finish. Lets many subplots be stopped at once before each is
+        terminated.
 
         Returns
         -------
@@ -455,8 +462,20 @@ class _Subplot():
         if self._THREADED:
             with self._LOCK:
                 self._done = True
-            if not self._thread is None:
-                self._thread.join()
+
+    def terminate(self):
+        """
+        Terminate the drawer thread (if it exists). MAKE SURE TO CALL THIS
+        WHEN DONE IF THREADED FLAG IS SET TO TRUE.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.stop()
+        if self._THREADED and not self._thread is None:
+            self._thread.join()
 
 ###############################################################################
 #LINE PLOT CLASS
@@ -501,10 +520,12 @@ class Lineplot(_Subplot):
         tail : int or tuple of ints optional
             Specifies how many data points are used to draw a line. Only the
             most recently added data points are kept. Any data points added
-            more than tail data points ago are discarded and not plotted. When
-            tuple, must have length n_lines. A value less than or equal to 0
-            means that no data is ever discarded and all data points added to
-            the animator will be drawn. The default is -1.
+            more than tail data points ago are discarded and not plotted,
+            though autoscaled axes still span every data point added since
+            the data were last set. When tuple, must have length n_lines. A
+            value less than or equal to 0 means that no data is ever
+            discarded and all data points added to the animator will be
+            drawn. The default is -1.
         title : string, optional
             The title of the plot. Will be written above the plot when
             rendered. The default is None.
@@ -551,6 +572,17 @@ class Lineplot(_Subplot):
         # Apply the user set kwargs
         self._apply_kwargs(kwargs)
 
+        # Lines with a tail store their data in bounded buffers so that
+        # appending a point evicts the oldest one in constant time
+        for line_ind in range(n_lines):
+            self.data['x'][line_ind] = self._make_buffer([], line_ind)
+            self.data['y'][line_ind] = self._make_buffer([], line_ind)
+
+        # Running [min, max] of every point added to each line. Tailed
+        # buffers discard old points, so autoscaling reads these instead
+        self._extremes = {'x' : [[np.inf, -np.inf] for _ in range(n_lines)],
+                          'y' : [[np.inf, -np.inf] for _ in range(n_lines)]}
+
         # Apply all settings to the axes on which the plot lives.
         self._apply_settings()
 
@@ -576,14 +608,87 @@ class Lineplot(_Subplot):
         ranges = self._get_ranges()
 
         # Update the plot extents
-        x_extent = self._update_x_extent(ranges['x'])
-        y_extent = self._update_y_extent(ranges['y'])
-        
-        # Check if the extents have changed. If they have this means the axes
-        # have changed and therefore the blitted background must be updated.
-        if not self._extents == (x_extent, y_extent):
-            with self._FIG_LOCK:
-                self.update_bg = True
+        self._update_x_extent(ranges['x'])
+        self._update_y_extent(ranges['y'])
+
+    def _get_ranges(self):
+        """
+        Gets the ranges of all data ever added to each line. Unlike the
+        stored data, these include points that have fallen off a tail.
+
+        Returns
+        -------
+        ranges : dictionary of 2tuples
+            A dictionary of the x and y ranges of all lines. (None, None) if
+            not enough data.
+
+        """
+        ranges = {}
+
+        # Aquire mutex lock to read the running extremes
+        with self._LOCK:
+            for key, extremes in self._extremes.items():
+                min_val = min(extreme[0] for extreme in extremes)
+                max_val = max(extreme[1] for extreme in extremes)
+                if min_val < np.inf and not min_val == max_val:
+                    ranges[key] = (min_val, max_val)
+                else:
+                    ranges[key] = (None, None)
+        return ranges
+
+    def _track_extremes(self, key, line_ind, values):
+        """
+        Widens one line's running x or y extremes to include new values.
+        The mutex lock must already be held by the caller.
+
+        Parameters
+        ----------
+        key : string
+            Either 'x' or 'y'.
+        line_ind : int
+            The line index whose extremes are updated.
+        values : list of floats
+            The values being added to the line.
+
+        Returns
+        -------
+        None.
+
+        """
+        if len(values) <= 0:
+            return
+        extreme = self._extremes[key][line_ind]
+        extreme[0] = min(extreme[0], min(values))
+        extreme[1] = max(extreme[1], max(values))
+
+    def _make_buffer(self, data, line_ind):
+        """
+        Makes the container that stores one artist's x or y data. Lines with
+        a tail greater than 0 use a deque bounded by the tail length, all
+        other lines use a list.
+
+        Parameters
+        ----------
+        data : iterable of floats
+            The initial data of the buffer. Numpy arrays are converted to
+            lists of floats in a single call.
+        line_ind : int
+            The line index whose data is stored in the buffer.
+
+        Returns
+        -------
+        buffer : list or collections.deque
+            The data buffer.
+
+        """
+        tail = self.options['artists']['tail'][line_ind]
+        if isinstance(data, np.ndarray):
+            data = data.tolist()
+            if tail <= 0:
+                return data
+        if tail > 0:
+            return deque(data, maxlen=tail)
+        return list(data)
 
     def _make_lines(self):
         """
@@ -604,7 +709,8 @@ class Lineplot(_Subplot):
             kwargs = {'c' : self.options['artists']['color'][line_ind],
                       'lw' : self.options['artists']['line_width'][line_ind],
                       'ls' : self.options['artists']['line_style'][line_ind],
-                      'label' : self.options['artists']['label'][line_ind]}
+                      'label' : self.options['artists']['label'][line_ind],
+                      'animated' : True}
 
             # Artists that have a tail length greater than 0
             # need a head marker.
@@ -620,8 +726,8 @@ class Lineplot(_Subplot):
 
                     # Make a line artist. Set the current data. Apply style and
                     # label options
-                    line, = self._axes.plot(self.data['x'][line_ind],
-                                            self.data['x'][line_ind],
+                    line, = self._axes.plot(list(self.data['x'][line_ind]),
+                                            list(self.data['y'][line_ind]),
                                             **kwargs)
 
                 lines.append(line)
@@ -655,9 +761,54 @@ class Lineplot(_Subplot):
         """
         # Aquire mutex lock to set self.data and flag
         with self._LOCK:
-            # Append the datum
-            self.data['x'][line_ind].append(copy(x_point))
-            self.data['y'][line_ind].append(copy(y_point))
+            # Append the datum. Numbers are immutable so are not copied
+            self.data['x'][line_ind].append(x_point)
+            self.data['y'][line_ind].append(y_point)
+            self._track_extremes('x', line_ind, (x_point,))
+            self._track_extremes('y', line_ind, (y_point,))
+
+            # Tell the drawer that the axes must be redrawn
+            self._need_redraw[line_ind] = True
+
+        # If unthreaded version is used, synchronously redraw plot
+        if not self._THREADED:
+            self.redraw()
+
+    def append_points(self, x_points, y_points, line_ind=0):
+        """
+        Appends a batch of data points to the end of one artist's data. The
+        mutex lock is aquired only once for the whole batch.
+
+        Parameters
+        ----------
+        x_points : list or numpy array of floats
+            The x coordinates of the data points being appended.
+        y_points : list or numpy array of floats
+            The y coordinates of the data points being appended.
+        line_ind : int, optional
+            The line index whose plot data is being updated. Does not need
+            to be changed if the plot only has one line. The default value
+            is 0.
+
+        Returns
+        -------
+        None.
+
+        """
+        # Numpy arrays are converted to lists of floats in a single call so
+        # that the stored data never holds numpy scalars
+        if isinstance(x_points, np.ndarray):
+            x_points = x_points.tolist()
+        if isinstance(y_points, np.ndarray):
+            y_points = y_points.tolist()
+
+        # Aquire mutex lock to set self.data and flag
+        with self._LOCK:
+            # Append the data
+            self.data['x'][line_ind].extend(x_points)
+            self.data['y'][line_ind].extend(y_points)
+            self._track_extremes('x', line_ind, x_points)
+            self._track_extremes('y', line_ind, y_points)
 
             # Tell the drawer that the axes must be redrawn
             self._need_redraw[line_ind] = True
@@ -684,9 +835,9 @@ class Lineplot(_Subplot):
 
         Parameters
         ----------
-        x_data : list of floats
+        x_data : list or numpy array of floats
             The plot's new x data points.
-        y_data : list of floats
+        y_data : list or numpy array of floats
             The plot's new y data points.
         line_ind : int, optional
             The line index whose plot data is being updated. Does not need
@@ -698,11 +849,22 @@ class Lineplot(_Subplot):
         None.
 
         """
+        # Convert numpy arrays once so the extremes and buffers share them
+        if isinstance(x_data, np.ndarray):
+            x_data = x_data.tolist()
+        if isinstance(y_data, np.ndarray):
+            y_data = y_data.tolist()
+
         # Aquire mutex lock to set self.data and flag
         with self._LOCK:
-            # Set the new data
-            self.data['x'][line_ind] = copy(x_data)
-            self.data['y'][line_ind] = copy(y_data)
+            # Set the new data. The extremes restart from the new data
+            # before the tail trims it
+            self._extremes['x'][line_ind] = [np.inf, -np.inf]
+            self._extremes['y'][line_ind] = [np.inf, -np.inf]
+            self._track_extremes('x', line_ind, x_data)
+            self._track_extremes('y', line_ind, y_data)
+            self.data['x'][line_ind] = self._make_buffer(x_data, line_ind)
+            self.data['y'][line_ind] = self._make_buffer(y_data, line_ind)
 
             # Tell the drawer that the axes must be redrawn
             self._need_redraw[line_ind] = True
@@ -717,10 +879,8 @@ class Lineplot(_Subplot):
 
         Returns
         -------
-        update_bg : bool
-        A boolean flag that indicates if the axes have changed and therefore 
-        require a background update.
-        
+        None.
+
         """
         # Aquire mutex lock to read flag
         with self._LOCK:
@@ -758,28 +918,23 @@ class Lineplot(_Subplot):
         # Aquire the line artist
         line = self._lines[line_ind]
 
-        # Aquire mutex lock to read self.data and set flag
+        # Aquire mutex lock to take a snapshot of self.data and set flag.
+        # The figure lock is not held at the same time so that setting data
+        # never has to wait for the figure to finish drawing.
+        tail = self.options['artists']['tail'][line_ind]
         with self._LOCK:
-
-            # Aquire mutex lock to draw to figure axes
-            with self._FIG_LOCK:
-                # Alias line data
-                x_dat = self.data['x'][line_ind]
-                y_dat = self.data['y'][line_ind]
-                tail = self.options['artists']['tail'][line_ind]
-
-                # Set the line data if there is a tail
-                if tail > 0:
-                    line.set_data(x_dat[-tail:], y_dat[-tail:])
-                    line.set_markevery((len(x_dat[-tail:])-1, 1))
-
-                # Set the line data if there is no tail
-                else:
-                    line.set_data(x_dat, y_dat)
+            x_dat = list(self.data['x'][line_ind])
+            y_dat = list(self.data['y'][line_ind])
 
             # Note that the artist has been redrawn
             self._need_redraw[line_ind] = False
 
+        # Aquire mutex lock to draw to figure axes
+        with self._FIG_LOCK:
+            line.set_data(x_dat, y_dat)
+            if tail > 0:
+                line.set_markevery((len(x_dat)-1, 1))
+
 ###############################################################################
 #BAR CHART CLASS
 ###############################################################################
@@ -881,13 +1036,7 @@ class Barchart(_Subplot):
         ranges = self._get_ranges()
 
         # Update the plot extents
-        x_extent = self._update_x_extent(ranges['x'])
-        
-        # Check if the extents have changed. If they have this means the axes
-        # have changed and therefore the blitted background must be updated.
-        if not self._extents == (x_extent, (None, None)):
-            with self._FIG_LOCK:
-                self.update_bg = True
+        self._update_x_extent(ranges['x'])
 
     def _make_bars(self):
         """
@@ -905,7 +1054,8 @@ class Barchart(_Subplot):
         kwargs = {'color' : self.options['artists']['color'],
                   'edgecolor' : ['k',]*self.options['axes']['n_artists'],
                   'linewidth' : [1.25,]*self.options['axes']['n_artists'],
-                  'align' : 'center',}
+                  'align' : 'center',
+                  'animated' : True,}
 
         # Aquire mutex lock to read self.values
         with self._LOCK:
@@ -954,6 +1104,38 @@ class Barchart(_Subplot):
         if not self._THREADED:
             self.redraw()
 
+    def set_values(self, values, bar_inds):
+        """
+        Set's multiple bars' values. The mutex lock is aquired only once for
+        all of the bars.
+
+        Parameters
+        ----------
+        values : list of floats
+            The values to which the bars are set.
+        bar_inds : list of ints
+            The bar indices whose values are set. Must be the same length
+            as values.
+
+        Returns
+        -------
+        None.
+
+        """
+        # Aquire mutex lock to set self.values and flags
+        with self._LOCK:
+
+            # Set the values
+            for value, bar_ind in zip(values, bar_inds):
+                self.data['x'][bar_ind].append(float(value))
+
+                # Tell the drawer that the axes must be redrawn
+                self._need_redraw[bar_ind] = True
+
+        # If unthreaded version is used, synchronously redraw plot
+        if not self._THREADED:
+            self.redraw()
+
     def reset_data(self):
         """
         Clears all data from chart.
@@ -1011,14 +1193,15 @@ class Barchart(_Subplot):
         # Aquire the artist
         bar_artist = self._bars[bar_ind]
 
-        # Aquire mutex lock to read self.data and set flag
+        # Aquire mutex lock to read self.data and set flag. The figure lock
+        # is not held at the same time so that setting values never has to
+        # wait for the figure to finish drawing.
         with self._LOCK:
-
-            # Aquire mutex lock to draw to figure axes
-            with self._FIG_LOCK:
-
-                # Update the line artist's data
-                bar_artist.set_width(self.data['x'][bar_ind][-1])
+            value = self.data['x'][bar_ind][-1]
 
             # Note that the artist has been redrawn
             self._need_redraw[bar_ind] = False
+
+        # Aquire mutex lock to draw to figure axes
+        with self._FIG_LOCK:
+            bar_artist.set_width(value)
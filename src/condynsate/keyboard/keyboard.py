@@ -14,6 +14,7 @@ SPDX-License-Identifier: GPL-3.0-only
 import time
 from copy import copy
 from warnings import warn
+from threading import (Lock, Event)
 from pynput.keyboard import (Listener, Key)
 
 ###############################################################################
@@ -66,10 +67,15 @@ class Keyboard:
         Constructor method.
 
         """
-        # Create buffer to hold all keys that are currently down
+        # Create buffer to hold all keys that are currently down. The mutex
+        # lock synchronizes the listener thread (writer) and the user (reader)
+        self._LOCK = Lock()
         self._key_buf = []
         self._mod_buf = []
 
+        # Set by the listener thread every time a key is pressed or released
+        self._event = Event()
+
 
         # Start the keyboard listener
         self._listener = Listener(self._on_press, self._on_release)
@@ -145,6 +151,28 @@ class Keyboard:
         return key_str in keys_pressed
 
 
+    def are_pressed(self, key_strs):
+        """
+        Returns a boolean flag for each of a set of keys to indicate whether
+        each key is pressed. The key buffers are read only once, so this is
+        faster than calling is_pressed for each key.
+
+        Parameters
+        ----------
+        key_strs : tuple of strings
+            The keys to be detected. See is_pressed for the valid key strings.
+
+        Returns
+        -------
+        tuple of bools
+            A boolean flag for each key in key_strs (in the same order) to
+            indicate whether that key is pressed.
+
+        """
+        keys_pressed = set(self._read_bufs())
+        return tuple(key_str in keys_pressed for key_str in key_strs)
+
+
     def await_press(self, key_str, timeout=None):
         """
         Waits until the user presses a specified key or until the timeout
@@ -181,14 +209,42 @@ class Keyboard:
         print(f"Awaiting '{key_str}' to be pressed...", flush=True, end='')
         start_time = time.time()
         while not self.is_pressed(key_str):
-            if not timeout is None and time.time() - start_time >= timeout:
-                print(f' Timed out after {timeout} seconds.', flush=True)
-                return -1
-            time.sleep(0.01)
+            remaining = None
+            if not timeout is None:
+                remaining = timeout - (time.time() - start_time)
+                if remaining <= 0.0:
+                    print(f' Timed out after {timeout} seconds.', flush=True)
+                    return -1
+            self.await_event(timeout=remaining)
         print(f" '{key_str}' pressed. Continuing", flush=True)
         return 0
 
 
+    def await_event(self, timeout=None):
+        """
+        Blocks until any key is pressed or released or until the timeout
+        condition is met. Unlike polling, this does not use any CPU while
+        waiting and returns as soon as the key event occurs.
+
+        Parameters
+        ----------
+        timeout : float > 0.0, optional
+            The timeout value in seconds. When None, waits indefinitely. The
+            default is None.
+
+        Returns
+        -------
+        ret_code: int
+            0 if a key event occured, -1 if the timeout value is reached
+            before any key event.
+
+        """
+        if not self._event.wait(timeout):
+            return -1
+        self._event.clear()
+        return 0
+
+
     def _read_bufs(self):
         """
         Reads the current key buffers and returns all key strings as a list.
@@ -214,11 +270,12 @@ class Keyboard:
 
         """
         keys_pressed = []
-        for k in self._key_buf:
-            key_str = copy(k)
-            for m in self._mod_buf:
-                key_str = m + key_str
-            keys_pressed.append(key_str)
+        with self._LOCK:
+            for k in self._key_buf:
+                key_str = copy(k)
+                for m in self._mod_buf:
+                    key_str = m + key_str
+                keys_pressed.append(key_str)
         return keys_pressed
 
 
@@ -240,8 +297,9 @@ class Keyboard:
             self._listening = False
 
         # Empty all buffers
-        self._key_buf = []
-        self._mod_buf = []
+        with self._LOCK:
+            self._key_buf = []
+            self._mod_buf = []
         return 0
 
 
@@ -360,14 +418,16 @@ class Keyboard:
         # Handle modifiers
         elif (key_str=="shift+" or key_str=="ctrl+" or
               key_str=="alt+" or key_str=="cmd+"):
-            if key_str not in self._mod_buf:
-                self._mod_buf.append(key_str)
+            with self._LOCK:
+                if key_str not in self._mod_buf:
+                    self._mod_buf.append(key_str)
             return 0
 
         # Handle other keys
         else:
-            if key_str not in self._key_buf:
-                self._key_buf.append(key_str)
+            with self._LOCK:
+                if key_str not in self._key_buf:
+                    self._key_buf.append(key_str)
             return 0
 
 
@@ -390,6 +450,10 @@ class Keyboard:
         if not self._add_to_buffer(key) == 0:
             m = 'Pressed key is not recognized. Ignoring.'
             warn(m, UserWarning)
+            return
+
+        # Wake anything awaiting a key event
+        self._event.set()
 
 
     def _remove_from_buffer(self, key):
@@ -417,16 +481,18 @@ class Keyboard:
         # Handle modifiers
         elif (key_str=="shift+" or key_str=="ctrl+" or
               key_str=="alt+" or key_str=="cmd+"):
-            if key_str in self._mod_buf:
-                idx = self._mod_buf.index(key_str)
-                self._mod_buf.pop(idx)
+            with self._LOCK:
+                if key_str in self._mod_buf:
+                    idx = self._mod_buf.index(key_str)
+                    self._mod_buf.pop(idx)
             return 0
 
         # Handle other keys
         else:
-            if key_str in self._key_buf:
-                idx = self._key_buf.index(key_str)
-                self._key_buf.pop(idx)
+            with self._LOCK:
+                if key_str in self._key_buf:
+                    idx = self._key_buf.index(key_str)
+                    self._key_buf.pop(idx)
             return 0
 
 
@@ -447,5 +513,6 @@ class Keyboard:
             False on termination event ('esc')
 
         """
-        self._remove_from_buffer(key)
+        if self._remove_from_buffer(key) == 0:
+            self._event.set()
         return True
@@ -4,10 +4,11 @@
 SPDX-License-Identifier: GPL-3.0-only
 """
 
-from condynsate.misc.videomaker import save_recording
+from condynsate.misc.videomaker import (save_recording, VideoStream)
 from condynsate.misc.exception_handling import print_exception
 import condynsate.misc.transforms as transforms
 
 __all__ = ["transforms",
            "save_recording",
+           "VideoStream",
            "print_exception",]
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """
-This module provides utilities functions used to render videos from zstd3333
-compressed frame data.
+This module provides utilities functions used to render videos either from
+zstd compressed frame data or by streaming frames as they are recorded.
 """
 """
 © Copyright, 2025 G. Schaer.
@@ -12,12 +12,30 @@ SPDX-License-Identifier: GPL-3.0-only
 #DEPENDENCIES
 ###############################################################################
 import os
+import shutil
+import subprocess
+from warnings import warn
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from compression import zstd
 import cv2
 import numpy as np
 from condynsate.exceptions import InvalidNameException
 from condynsate.misc.exception_handling import ESC
 
+# The h.264 encoders that are tried, fastest first, and the ffmpeg
+# arguments used with each
+H264_ENCODERS = {'h264_nvenc' : ['-preset', 'p4', '-tune', 'hq', '-rc', 'vbr',
+                                 '-b:v', '0', '-cq', '23'],
+                 'h264_videotoolbox' : ['-b:v', '8M', '-allow_sw', '1'],
+                 'h264_qsv' : [],
+                 'libx264' : ['-preset', 'ultrafast', '-tune', 'zerolatency']}
+ENCODER_CACHE = {}
+
+# Characters that may not appear in video file names
+ILLEGAL_CHARS = ("<", ">", ":", "|", "?", "*", ".", "\"", "\'",)
+ILLEGAL_TABLE = str.maketrans('', '', ''.join(ILLEGAL_CHARS))
+
 ###############################################################################
 #VIDEO RENDERING FUNCTIONS
 ###############################################################################
@@ -45,10 +63,9 @@ def _get_valid_name_(file_name, file_container):
         The validated file name in format "valid_file_name.file_container".
 
     """
-    illegal_chars = ("<", ">", ":", "|", "?", "*", ".", "\"", "\'",)
-    if any(illegal_char in file_name for illegal_char in illegal_chars):
+    if len(file_name.translate(ILLEGAL_TABLE)) != len(file_name):
         msg = "May not include the characters {}."
-        msg = msg.format(r' '.join(illegal_chars))
+        msg = msg.format(r' '.join(ILLEGAL_CHARS))
         raise InvalidNameException(msg, (file_name, -1))
 
     if len(file_name) == 0:
@@ -56,14 +73,16 @@ def _get_valid_name_(file_name, file_container):
         msg = msg.format(file_name)
         raise InvalidNameException(msg, (file_name, -1))
 
+    # List the current working directory only once
+    existing = set(os.listdir(os.getcwd()))
     valid_file = f"{file_name}.{file_container}"
-    if not valid_file in os.listdir(os.path.abspath(os.getcwd())):
+    if not valid_file in existing:
         return valid_file
 
     max_append = 99
     for i in range(max_append):
         valid_file = f"{file_name}_{i+1:02}.{file_container}"
-        if not valid_file in os.listdir(os.path.abspath(os.getcwd())):
+        if not valid_file in existing:
             return valid_file
 
     msg = "Too many files already exist with the same name."
@@ -149,27 +168,80 @@ def _get_fps_and_frames(frames, frame_times):
     # Get the video frame times spaced by the fps
     vid_frame_times = np.arange(0.0, max(frame_times), 1.0/vid_fps)
 
-    # Match each captured frame to a video frame time
-    cap_frame_idxs = [np.argmin(abs(t-vid_frame_times)) for t in frame_times]
+    # Match each captured frame to the nearest video frame time. The video
+    # frame times are sorted, so this is a search of the midpoints between
+    # them
+    edges = 0.5 * (vid_frame_times[:-1] + vid_frame_times[1:])
+    cap_frame_idxs = np.searchsorted(edges, frame_times)
 
     # Make the video frames by keying the captured frames via their
-    # frame_idxs and then copying the previous video frame to fill unkeyed
-    # video frames
-    vid_frames = [None, ] * len(vid_frame_times)
-    for i, cap_frame_idx in enumerate(cap_frame_idxs):
-        vid_frames[cap_frame_idx] = frames[i]
-    prev_cap_frame = vid_frames[0]
-    for i in range(len(vid_frame_times)):
-        if not vid_frames[i] is None:
-            prev_cap_frame = vid_frames[i]
-        else:
-            vid_frames[i] = prev_cap_frame
+    # frame_idxs (the last captured frame wins) and then copying the
+    # previous video frame to fill unkeyed video frames
+    keyed = np.full(len(vid_frame_times), -1, dtype=np.int64)
+    np.maximum.at(keyed, cap_frame_idxs, np.arange(len(cap_frame_idxs)))
+    np.maximum.accumulate(keyed, out=keyed)
+    vid_frames = [frames[i] if i >= 0 else None for i in keyed.tolist()]
     return vid_fps, vid_frames
 
+def _decode_frame(frame):
+    """
+    Decodes a single zstd compressed RGB frame to a BGR image.
+
+    Parameters
+    ----------
+    frame : tuple of form (bytes, (int, int, int))
+        The zstd compressed RGB frame and its shape.
+
+    Returns
+    -------
+    img : m x n x 3 numpy array of dtype np.uint8
+        The decoded BGR image.
+
+    """
+    dat, shape = frame
+    # Convert the RGB image to a contiguous BGR image in a single pass
+    img = np.frombuffer(zstd.decompress(dat), np.uint8).reshape(shape)
+    return cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+
+def _decode_frames(vid_frames, n_prefetch=16):
+    """
+    Decodes zstd compressed frames, in order, in a background thread pool so
+    that decoding overlaps with encoding. Consecutive repeats of the same
+    frame are only decoded once.
+
+    Parameters
+    ----------
+    vid_frames : list of tuples of form (bytes, (int, int, int))
+        The zstd compressed video frames and their shapes.
+    n_prefetch : int, optional
+        The maximum number of frames decoded ahead of the one being
+        yielded. The default is 16.
+
+    Yields
+    ------
+    img : m x n x 3 numpy array of dtype np.uint8
+        Each decoded BGR image.
+
+    """
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+        pending = deque()
+        prev_frame = None
+        prev_future = None
+        for f in vid_frames:
+            if not f is prev_frame:
+                prev_future = pool.submit(_decode_frame, f)
+                prev_frame = f
+            pending.append(prev_future)
+            if len(pending) >= n_prefetch:
+                yield pending.popleft().result()
+        while len(pending) > 0:
+            yield pending.popleft().result()
+
 def _make_video(vid_fps, vid_frames, name):
     """
-    Takes a set of compressed frames and a target FPS and renders them
-    to animator_video.mp4 with the h.264 codec.
+    Takes a set of zstd compressed frames and a target FPS and renders them
+    to an MP4 video. Frames are piped to an h.264 encoder when ffmpeg is
+    available, otherwise they are encoded with OpenCV.
 
     Parameters
     ----------
@@ -199,29 +271,61 @@ def _make_video(vid_fps, vid_frames, name):
     # Get a valid directory name
     fname = _get_valid_name(name, 'mp4')
 
-    # Make the video
+    # Pipe the frames to ffmpeg if available. Frames are padded to the
+    # largest captured frame and ffmpeg scales them to the video size.
+    encoder = _get_h264_encoder()
+    if not encoder is None:
+        cap_size = (int(cap_frame_width), int(cap_frame_height))
+        proc = _open_ffmpeg(fname, cap_size, vid_size, vid_fps, 'bgr24',
+                            encoder)
+        try:
+            for img in _decode_frames(vid_frames):
+                if img.shape[:2] != (cap_size[1], cap_size[0]):
+                    pad = ((0, cap_size[1] - img.shape[0]),
+                           (0, cap_size[0] - img.shape[1]), (0, 0))
+                    img = np.pad(img, pad)
+                proc.stdin.write(np.ascontiguousarray(img).data)
+        except BaseException:
+            # Do not leave ffmpeg running if it died or decoding failed
+            proc.kill()
+            raise
+        finally:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+            proc.wait()
+        if proc.returncode != 0:
+            return -1
+        return 0
+
+    # Otherwise, make the video with OpenCV. Bilinear interpolation is used
+    # to upscale and area interpolation is used to downscale.
+    interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+    cap_shape = (cap_frame_height, cap_frame_width)
+    canvas = np.zeros((vid_size[1], vid_size[0], 3), dtype=np.uint8)
+    canvas_fill = (0, 0)
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     out = cv2.VideoWriter(fname, fourcc, vid_fps, vid_size)
-    for f in vid_frames:
-        dat = zstd.decompress(f[0])
-        img = np.frombuffer(dat, np.uint8).reshape(f[1])
-        img = img[:, :, ::-1] # Convert RGB image to BGR
-
-        # Upscale to 1080p
-        img = cv2.resize(img, dsize=None, fx=scale, fy=scale,
-                         interpolation=cv2.INTER_CUBIC)
-
-        # Ensure proper shape
-        if not img.shape[0] == vid_size[1]:
-            n_rows_add = vid_size[1] - img.shape[0]
-            rows_shape = (n_rows_add, img.shape[1], img.shape[2])
-            rows = np.zeros(rows_shape, dtype=np.uint8)
-            img = np.concatenate((img, rows), axis=0)
-        if not img.shape[1] == vid_size[0]:
-            n_cols_add = vid_size[0] - img.shape[1]
-            cols_shape = (img.shape[0], n_cols_add, img.shape[2])
-            cols = np.zeros(cols_shape, dtype=np.uint8)
-            img = np.concatenate((img, cols), axis=1)
+    for img in _decode_frames(vid_frames):
+
+        # Scale to 1080p. Full size frames are scaled directly to the video
+        # size
+        if img.shape[:2] == cap_shape:
+            img = cv2.resize(img, dsize=vid_size,
+                             interpolation=interpolation)
+        else:
+            img = cv2.resize(img, dsize=None, fx=scale, fy=scale,
+                             interpolation=interpolation)
+
+        # Ensure proper shape by copying smaller frames into the top left
+        # of a single, reused, black canvas
+        if img.shape[:2] != canvas.shape[:2]:
+            if img.shape[:2] != canvas_fill:
+                canvas[...] = 0
+                canvas_fill = img.shape[:2]
+            canvas[:img.shape[0], :img.shape[1]] = img
+            img = canvas
 
         # Write the frame
         out.write(img)
@@ -254,3 +358,315 @@ def save_recording(frames, frame_times, name='recording'):
         return _make_video(vid_fps, vid_frames, name)
     except Exception:
         return -1
+
+###############################################################################
+#VIDEO STREAMING CLASS
+###############################################################################
+def _encoder_works(encoder):
+    """
+    Checks if an ffmpeg encoder can actually encode on this machine by
+    encoding a short blank clip. Hardware encoders can be listed by ffmpeg
+    even when no supporting hardware is present.
+
+    Parameters
+    ----------
+    encoder : string
+        The name of the encoder.
+
+    Returns
+    -------
+    bool
+        True if the encoder works, else false.
+
+    """
+    cmd = ['ffmpeg', '-hide_banner', '-loglevel', 'error',
+           '-f', 'lavfi', '-i', 'nullsrc=s=256x256:d=0.1',
+           '-c:v', encoder, '-f', 'null', '-']
+    try:
+        out = subprocess.run(cmd, capture_output=True, timeout=10.)
+        return out.returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+def _get_h264_encoder():
+    """
+    Finds the fastest available ffmpeg h.264 encoder. Prefers the hardware
+    accelerated NVENC, VideoToolbox, and Quick Sync encoders, in that
+    order, over libx264. The result is cached after the first call.
+
+    Returns
+    -------
+    encoder : string or None
+        The name of the encoder. None if ffmpeg is not available.
+
+    """
+    if 'h264' in ENCODER_CACHE:
+        return ENCODER_CACHE['h264']
+    encoder = None
+    if not shutil.which('ffmpeg') is None:
+        encoder = 'libx264'
+        try:
+            cmd = ['ffmpeg', '-hide_banner', '-encoders']
+            out = subprocess.run(cmd, capture_output=True, text=True,
+                                 timeout=10.)
+            for hw_encoder in list(H264_ENCODERS)[:-1]:
+                if hw_encoder in out.stdout and _encoder_works(hw_encoder):
+                    encoder = hw_encoder
+                    break
+        except (OSError, subprocess.SubprocessError):
+            pass
+    ENCODER_CACHE['h264'] = encoder
+    return encoder
+
+def _open_ffmpeg(fname, img_size, vid_size, fps, pix_fmt, encoder):
+    """
+    Starts an ffmpeg process that encodes raw frames written to its stdin
+    to an h.264 MP4 video.
+
+    Parameters
+    ----------
+    fname : string
+        The file name of the video.
+    img_size : 2 tuple of ints
+        The (width, height) of the raw frames.
+    vid_size : 2 tuple of ints
+        The (width, height) of the video. ffmpeg scales the frames to it.
+    fps : float
+        The fps of the video.
+    pix_fmt : string
+        The ffmpeg pixel format of the raw frames, either 'rgb24' or
+        'bgr24'.
+    encoder : string
+        The name of the ffmpeg h.264 encoder.
+
+    Returns
+    -------
+    proc : subprocess.Popen
+        The ffmpeg process. Close its stdin and wait for it to finish the
+        video.
+
+    """
+    cmd = ['ffmpeg', '-loglevel', 'error', '-y',
+           '-f', 'rawvideo', '-pix_fmt', pix_fmt,
+           '-s', f'{img_size[0]}x{img_size[1]}',
+           '-r', f'{fps}', '-i', '-',
+           '-vf', f'scale={vid_size[0]}:{vid_size[1]}',
+           '-c:v', encoder, '-pix_fmt', 'yuv420p']
+    cmd += H264_ENCODERS.get(encoder, [])
+    cmd.append(fname)
+    return subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+class VideoStream():
+    """
+    Encodes frames to a constant FPS MP4 video as they are recorded.
+    Unlike save_recording, frames are not held in memory. When ffmpeg is
+    available, frames are piped to an h.264 encoder running in its own
+    process. Otherwise, frames are encoded with OpenCV.
+
+    Parameters
+    ----------
+    name : string
+        The name of the file to save the video to.
+    frame_rate : float
+        The nominal rate, in frames per second, at which frames are recorded.
+        The video fps is this rounded up to the nearest 5 and clipped to
+        between 20 and 120.
+    height : int, optional
+        The height, in pixels, of the video. Frames are scaled to this
+        height, keeping their aspect ratio. Rounded to an even number.
+        The default is 1080.
+
+    """
+    def __init__(self, name, frame_rate, height=1080):
+        """
+        Constructor func.
+        """
+        self._name = name
+        self._height = max(2, 2*int(round(height/2.0)))
+        vid_fps = np.ceil(frame_rate/5.0)*5.0 # Round up to nearest 5
+        self._fps = float(np.clip(vid_fps, 20.0, 120.0)) # Clip the fps
+        self._fname = None
+        self._ffmpeg = None
+        self._writer = None
+        self._vid_size = None
+        self._img_shape = None
+        self._t0 = None
+        self._prev = None
+        self._n_written = 0
+        self._failed = False
+
+    def _open(self, img_shape):
+        """
+        Opens the video file and encoder based on the size of the first frame.
+
+        Parameters
+        ----------
+        img_shape : 3 tuple of ints
+            The shape of the first frame in the form (m, n, 3).
+
+        Returns
+        -------
+        None.
+
+        """
+        # Get the video frame size (scale to the video height)
+        scale = self._height/img_shape[0]
+        vid_frame_width = int(np.round(scale * img_shape[1]))
+        vid_frame_width += (vid_frame_width)%2 # Make sure even size
+        self._vid_size = (vid_frame_width, self._height)
+
+        # Get a valid directory name
+        self._fname = _get_valid_name(self._name, 'mp4')
+
+        # Pipe raw RGB frames to ffmpeg if available
+        encoder = _get_h264_encoder()
+        if not encoder is None:
+            img_size = (img_shape[1], img_shape[0])
+            self._ffmpeg = _open_ffmpeg(self._fname, img_size, self._vid_size,
+                                        self._fps, 'rgb24', encoder)
+            self._img_shape = img_shape
+            return
+
+        # Otherwise, use OpenCV
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        self._writer = cv2.VideoWriter(self._fname, fourcc, self._fps,
+                                       self._vid_size)
+        self._img_shape = img_shape
+
+    def _encode(self, img):
+        """
+        Writes a single frame to the video.
+
+        Parameters
+        ----------
+        img : m x n x 3 numpy array of dtype np.uint8
+            The RGB frame being written.
+
+        Returns
+        -------
+        None.
+
+        """
+        # Ensure each frame matches the size of the first frame
+        if img.shape != self._img_shape:
+            dsize = (self._img_shape[1], self._img_shape[0])
+            img = cv2.resize(img, dsize=dsize, interpolation=cv2.INTER_AREA)
+
+        # ffmpeg scales the frames itself
+        if not self._ffmpeg is None:
+            self._ffmpeg.stdin.write(np.ascontiguousarray(img).data)
+            return
+
+        # Convert RGB image to BGR and scale to the video size
+        if self._height < img.shape[0]:
+            interpolation = cv2.INTER_AREA
+        else:
+            interpolation = cv2.INTER_LINEAR
+        img = cv2.resize(img[:, :, ::-1], dsize=self._vid_size,
+                         interpolation=interpolation)
+        self._writer.write(img)
+
+    def write(self, image, frame_time):
+        """
+        Adds a frame to the video. Frames are repeated or dropped as needed
+        to keep the video at a constant fps.
+
+        Parameters
+        ----------
+        image : m x n x 3 numpy array of dtype np.uint8
+            The RGB frame being recorded.
+        frame_time : float
+            The time, in seconds, at which the frame was recorded.
+
+        Returns
+        -------
+        ret_code : int
+            0 if successful, -1 if something went wrong. Once a frame fails
+            to encode (e.g. ffmpeg exited), every later call returns -1
+            without writing until the video is closed or discarded.
+
+        """
+        if self._failed:
+            return -1
+        try:
+            if self._t0 is None:
+                self._open(image.shape)
+                self._t0 = frame_time
+
+            # Hold the previous frame until the video time reaches this frame
+            vid_idx = int(np.round((frame_time - self._t0) * self._fps))
+            while not self._prev is None and self._n_written < vid_idx:
+                self._encode(self._prev)
+                self._n_written += 1
+            self._prev = image
+            return 0
+        except Exception:
+            # Stop writing rather than failing on every later frame
+            self._failed = True
+            self._prev = None
+            m = f"Failed to encode the {self._name} video. Recording stopped."
+            warn(m, UserWarning)
+            return -1
+
+    def discard(self):
+        """
+        Closes the video and deletes everything recorded so far. The next
+        call to write starts a new video.
+
+        Returns
+        -------
+        ret_code : int
+            0 if successful, -1 if something went wrong.
+
+        """
+        self._prev = None
+        self.close()
+        self._failed = False
+        try:
+            if not self._fname is None and os.path.exists(self._fname):
+                os.remove(self._fname)
+        except OSError:
+            return -1
+        finally:
+            self._fname = None
+        return 0
+
+    def close(self):
+        """
+        Writes the last frame and finishes the video. Videos with fewer than
+        two frames are deleted.
+
+        Returns
+        -------
+        ret_code : int
+            0 if successful, -1 if something went wrong.
+
+        """
+        ret_code = -1 if self._failed else 0
+        try:
+            if not self._prev is None:
+                self._encode(self._prev)
+                self._n_written += 1
+        except Exception:
+            ret_code = -1
+        if not self._ffmpeg is None:
+            try:
+                self._ffmpeg.stdin.close()
+            except (OSError, ValueError):
+                ret_code = -1
+            if self._ffmpeg.wait() != 0:
+                ret_code = -1
+        if not self._writer is None:
+            self._writer.release()
+        if self._n_written < 2 and not self._fname is None:
+            try:
+                os.remove(self._fname)
+            except OSError:
+                pass
+        self._ffmpeg = None
+        self._writer = None
+        self._t0 = None
+        self._prev = None
+        self._n_written = 0
+        self._failed = False
+        return ret_code
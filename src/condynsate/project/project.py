@@ -12,7 +12,9 @@ SPDX-License-Identifier: GPL-3.0-only
 #DEPENDENCIES
 ###############################################################################
 import time
+import math
 import signal
+import weakref
 from warnings import warn
 from condynsate.simulator import Simulator
 from condynsate.visualizer import Visualizer
@@ -72,6 +74,10 @@ class Project:
         function call, these frames are saved with h.264 and outputs in
         an MP4 container. The saved file name has the form
         animator.mp4. The default is False.
+    animator_record_scale : float, optional
+        The height of the animator recording as a fraction of 1080p. Must
+        be a positive, finite number. Smaller values are faster to encode.
+        The default is 1.0.
     keyboard : bool, optional
         A boolean flag that indicates if the project should include a
         keyboard module. This keyboard module provides keyboard interactivity
@@ -96,10 +102,27 @@ class Project:
         The current simulation time in seconds.
 
     """
+    # Weak references to every live project, oldest first, and the handlers
+    # that the shared signal dispatcher replaced. The signal module only
+    # ever holds the dispatcher, never a project, so projects can still be
+    # garbage collected.
+    _INSTANCES = []
+    _PREV_HANDLERS = {}
+
     def __init__(self, **kwargs):
-        # Asynch listen for script exit
-        signal.signal(signal.SIGTERM, self._sig_handler)
-        signal.signal(signal.SIGINT, self._sig_handler)
+        # Track whether the project is terminated so that terminate is only
+        # ever run once (by the user, a signal, or the deconstructor)
+        self._terminated = False
+
+        # Asynch listen for script exit. The dispatcher is only installed
+        # over the default handlers so that handlers set by a parent
+        # framework are kept. Later projects share an installed dispatcher.
+        Project._INSTANCES.append(weakref.ref(self))
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            prev = signal.getsignal(sig)
+            if prev in (signal.SIG_DFL, signal.default_int_handler):
+                signal.signal(sig, Project._dispatch_sig)
+                Project._PREV_HANDLERS[sig] = prev
 
         # Build the simulator, visualizer, animator, and keyboard
         gravity = kwargs.get('simulator_gravity', (0.0, 0.0, -9.81))
@@ -115,7 +138,15 @@ class Project:
         if kwargs.get('animator', False):
             frame_rate = kwargs.get('animator_frame_rate', 15.0)
             record = kwargs.get('animator_record', False)
-            self._animator = Animator(frame_rate=frame_rate, record=record)
+            record_scale = kwargs.get('animator_record_scale', 1.0)
+            if (not isinstance(record_scale, (int, float)) or
+                not math.isfinite(record_scale) or record_scale <= 0):
+                m = "animator_record_scale must be a positive number. "
+                m += "Using 1.0."
+                warn(m, UserWarning)
+                record_scale = 1.0
+            self._animator = Animator(frame_rate=frame_rate, record=record,
+                                      record_scale=record_scale)
         if kwargs.get('keyboard', False):
             self._keyboard = Keyboard()
 
@@ -126,6 +157,37 @@ class Project:
         """
         self.terminate()
 
+    @staticmethod
+    def _dispatch_sig(sig, frame):
+        """
+        Passes a termination signal to the most recently created project
+        that is still running. If there is no such project, the signal is
+        handled by the handler that the dispatcher replaced.
+
+        Parameters
+        ----------
+        sig : int
+            The signal number.
+        frame : signal.frame object
+            The current stack frame.
+
+        Returns
+        -------
+        None.
+
+        """
+        for ref in reversed(Project._INSTANCES):
+            project = ref()
+            if not project is None and not project._terminated:
+                project._sig_handler(sig, frame)
+                return
+        prev = Project._PREV_HANDLERS.get(sig, signal.SIG_DFL)
+        if callable(prev):
+            prev(sig, frame)
+        else:
+            signal.signal(sig, prev)
+            signal.raise_signal(sig)
+
     def _sig_handler(self, sig, frame):
         """
         Handles script termination events so the simulator, visualizer,
@@ -148,6 +210,31 @@ class Project:
         warn(m, UserWarning)
         self.terminate()
 
+    def _restore_sig_handlers(self):
+        """
+        Removes the project from the signal dispatcher. When no running
+        projects remain, restores the signal handlers that the dispatcher
+        replaced.
+
+        Returns
+        -------
+        None.
+
+        """
+        Project._INSTANCES = [ref for ref in Project._INSTANCES
+                              if not ref() in (None, self)]
+        if len(Project._INSTANCES) > 0:
+            return
+        for sig, prev in list(Project._PREV_HANDLERS.items()):
+            try:
+                if signal.getsignal(sig) == Project._dispatch_sig:
+                    signal.signal(sig, prev)
+                del Project._PREV_HANDLERS[sig]
+            except ValueError:
+                # Signal handlers can only be set from the main thread. The
+                # dispatcher stays installed and falls back to prev.
+                continue
+
     @property
     def simulator(self):
         """
@@ -312,11 +399,11 @@ class Project:
             for body in self.bodies:
                 body.clear_visual_buffer()
             return -1
-        for body in self.bodies:
-            for d in body.visual_data:
-                self._visualizer.add_object(**d)
-                self._visualizer.set_transform(**d)
-                self._visualizer.set_material(**d)
+        data = [d for body in self.bodies for d in body.visual_data]
+        for d in data:
+            self._visualizer.add_object(**d)
+            self._visualizer.set_material(**d)
+        self._visualizer.set_transforms(data)
         return 0
 
     def refresh_animator(self):
@@ -385,7 +472,10 @@ class Project:
                 return 0
             self.refresh_visualizer()
             self.refresh_animator()
-            time.sleep(0.005)
+
+            # Wait for the next key event, but not so long that the
+            # visualizer and animator stop refreshing
+            self._keyboard.await_event(timeout=0.005)
 
     def await_anykeys(self, timeout=None):
         """
@@ -421,7 +511,10 @@ class Project:
                 return pressed
             self.refresh_visualizer()
             self.refresh_animator()
-            time.sleep(0.005)
+
+            # Wait for the next key event, but not so long that the
+            # visualizer and animator stop refreshing
+            self._keyboard.await_event(timeout=0.005)
 
     def terminate(self):
         """
@@ -433,6 +526,13 @@ class Project:
             0 if successful, -1 if something went wrong.
 
         """
+        # Set the flag before doing any work so that a signal arriving while
+        # terminating does not start a second, overlapping terminate
+        if self._terminated:
+            return 0
+        self._terminated = True
+
+        self._restore_sig_handlers()
         ret_code = self._simulator.terminate()
         if not self._visualizer is None:
             ret_code += self._visualizer.terminate()
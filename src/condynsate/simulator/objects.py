@@ -67,6 +67,7 @@ class Body():
     def __init__(self, client, path, **kwargs):
         self._client = client
         self._id = self._load_urdf(path, **kwargs)
+        self._mass_props = None
         (self.name, self.links, self.joints) = self._make_links_joints()
         self._arrows = {'com_force' : [],
                         'base_torque' : []}
@@ -151,14 +152,7 @@ class Body():
     @property
     def center_of_mass(self):
         """ The position of the center of mass of the object. """
-        link_ids, Obws, oris = self._get_all_link_pos_ori()
-        Rbws = [t.Rbw_from_wxyz(ori) for ori in oris]
-        masses = []
-        coms = []
-        for link_id, Obw, Rbw in zip(link_ids, Obws, Rbws):
-            info = self._client.getDynamicsInfo(self._id, link_id,)
-            masses.append(info[0])
-            coms.append(tuple(t.pa_to_pb(Rbw, Obw, info[3]).tolist()))
+        masses, coms = self._get_link_coms()
         return tuple(np.average(coms, weights=masses, axis=0).tolist())
 
     @property
@@ -228,6 +222,29 @@ class Body():
                 link.arrows['force'][i] = None
         return 0
 
+    def _get_mass_props(self):
+        # The masses and local centers of mass of the links only change when
+        # a link's mass is set, so they are only read from the engine once
+        # and then reused until Link.set_dynamics invalidates them.
+        if self._mass_props is None:
+            link_ids = sorted(link.visual_data['id']
+                              for link in self.links.values())
+            infos = [self._client.getDynamicsInfo(self._id, link_id,)
+                     for link_id in link_ids]
+            masses = np.array([info[0] for info in infos])
+            local_coms = np.array([info[3] for info in infos])
+            self._mass_props = (masses, local_coms)
+        return self._mass_props
+
+    def _get_link_coms(self):
+        # Get the mass and world center of mass of every link, ordered by
+        # link id (so the base link is first)
+        masses, local_coms = self._get_mass_props()
+        _, Obws, oris = self._get_all_link_pos_ori()
+        Rbws = np.array([t.Rbw_from_wxyz(ori) for ori in oris])
+        coms = np.einsum('nij,nj->ni', Rbws, local_coms) + np.array(Obws)
+        return masses, coms
+
     def _get_all_link_pos_ori(self):
         # Get the base state
         base_state = self._client.getBasePositionAndOrientation(self._id)
@@ -512,18 +529,9 @@ class Body():
         # Explicit calc like this requires one less center_of_mass call and
         # also allows use of getLinkStates instead of getLinkState which
         # reduces overhead
-        link_ids, Obws, oris = self._get_all_link_pos_ori()
-        Rbws = [t.Rbw_from_wxyz(ori) for ori in oris]
-        mass = []
-        com = []
-        base_com = None
-        for link_id, Obw, Rbw in zip(link_ids, Obws, Rbws):
-            info = self._client.getDynamicsInfo(self._id, link_id,)
-            mass.append(info[0])
-            com.append(tuple(t.pa_to_pb(Rbw, Obw, info[3]).tolist()))
-            if link_id == -1:
-                base_com = com[-1]
-        com = tuple(np.average(com, weights=mass, axis=0).tolist())
+        mass, coms = self._get_link_coms()
+        base_com = tuple(coms[0].tolist())
+        com = tuple(np.average(coms, weights=mass, axis=0).tolist())
 
         # Get the required counter torque
         torque = tuple(np.cross(np.subtract(base_com, com), force).tolist())
@@ -584,6 +592,67 @@ class Body():
         self._add_arrow(Obw,torque,'base_torque',(None, None, 0.01),**kwargs)
         return 0
 
+    def apply_joint_torques(self, torques, **kwargs):
+        """
+        Applies torques to a set of the body's joints for a single simulation
+        step. All torques are sent to the physics engine in a single call,
+        so this is faster than calling apply_torque on each joint.
+
+        Parameters
+        ----------
+        torques : dict of floats
+            A dictionary whose keys are joint names and whose values are the
+            torques applied about each joint's axis.
+        **kwargs
+
+        Keyword Args
+        ------------
+        draw_arrow : bool, optional
+            A Boolean flag that indicates if arrows should be drawn
+            to represent the applied torques. The default is False.
+        arrow_scale : float, optional
+            The scaling factor, relative to the size of the applied torques,
+            that is used to size the torque arrows. The default is 1.0.
+        arrow_offset : float or dict of floats, optional
+            The amount by which each drawn arrow is offset from the center of
+            its joint's child link along the joint axis. May either be a
+            single value applied to all joints or a dictionary whose keys are
+            joint names and whose values are offsets. The default is 0.0.
+
+        Returns
+        -------
+        ret_code : int
+            0 if successful, -1 if something went wrong.
+
+        """
+        try:
+            joints = [self.joints[name] for name in torques.keys()]
+            forces = [float(torque) for torque in torques.values()]
+        except (KeyError, AttributeError):
+            warn('Cannot apply torques, invalid joint name.')
+            return -1
+        except (TypeError, ValueError):
+            warn('Cannot apply torques, invalid torque value.')
+            return -1
+        if any(j._type == self._client.JOINT_FIXED for j in joints):
+            warn("Cannot apply torque to a fixed joint.")
+            return -1
+        self._client.setJointMotorControlArray(self._id,
+                                               [j._id for j in joints],
+                                               self._client.TORQUE_CONTROL,
+                                               forces=forces)
+
+        # Add arrow information for rendering
+        if kwargs.get('draw_arrow', False):
+            scale = kwargs.get('arrow_scale', 1.0)
+            offset = kwargs.get('arrow_offset', 0.0)
+            for name, joint, force in zip(torques.keys(), joints, forces):
+                if isinstance(offset, dict):
+                    joint._add_arrow(force, scale, offset.get(name, 0.0))
+                else:
+                    joint._add_arrow(force, scale, offset)
+        return 0
+
     def reset(self):
         """
         Resets body and each of its joints to their initial conditions.
@@ -640,6 +709,7 @@ class Joint:
     """
     def __init__(self, sim_obj, idx, child):
         self._client = sim_obj._client
+        self._body = sim_obj
         self._body_id = sim_obj._id
         self._id = idx
         self._child = child
@@ -847,27 +917,30 @@ class Joint:
 
         # Add arrow information for rendering
         if kwargs.get('draw_arrow', False):
-            info = self._client.getJointInfo(self._body_id, self._id)
-            Ojw, Rcw = self._child.Obw_Rbw
-            axisw = t.va_to_vb(Rcw, info[13])
-            offset = kwargs.get('arrow_offset', 0.0)
-            position = tuple(o+offset*a for o, a in zip(Ojw, axisw))
-            scale = kwargs.get('arrow_scale', 1.0)
-            arrow_dat = {'position' : position,
-                         'value' : tuple(float(torque*x) for x in axisw),
-                         'scale' : (scale, scale, 0.01)}
-            if len(self.arrows['torque']) == 0:
-                self.arrows['torque'].append(arrow_dat)
-            else:
-                for i, val in enumerate(self.arrows['torque']):
-                    if val is None:
-                        self.arrows['torque'][i] = arrow_dat
-                        break
-                    if i == len(self.arrows['torque']) - 1:
-                        self.arrows['torque'].append(arrow_dat)
-                        break
+            self._add_arrow(torque,
+                            kwargs.get('arrow_scale', 1.0),
+                            kwargs.get('arrow_offset', 0.0))
         return 0
 
+    def _add_arrow(self, torque, scale, offset):
+        info = self._client.getJointInfo(self._body_id, self._id)
+        Ojw, Rcw = self._child.Obw_Rbw
+        axisw = t.va_to_vb(Rcw, info[13])
+        position = tuple(o+offset*a for o, a in zip(Ojw, axisw))
+        arrow_dat = {'position' : position,
+                     'value' : tuple(float(torque*x) for x in axisw),
+                     'scale' : (scale, scale, 0.01)}
+        if len(self.arrows['torque']) == 0:
+            self.arrows['torque'].append(arrow_dat)
+        else:
+            for i, val in enumerate(self.arrows['torque']):
+                if val is None:
+                    self.arrows['torque'][i] = arrow_dat
+                    break
+                if i == len(self.arrows['torque']) - 1:
+                    self.arrows['torque'].append(arrow_dat)
+                    break
+
     def reset(self):
         """
         Resets the joint to its initial conditions.
@@ -917,6 +990,7 @@ class Link:
     """
     def __init__(self, sim_obj, idx):
         self._client = sim_obj._client
+        self._body = sim_obj
         self._body_id = sim_obj._id
         self._id = idx
         self._set_defaults()
@@ -1067,6 +1141,10 @@ class Link:
             return -1
 
         self._client.changeDynamics(self._body_id, self._id, **args)
+
+        # The body's cached mass properties are no longer valid
+        if 'mass' in args:
+            self._body._mass_props = None
         return 0
 
     def set_color(self, color):
@@ -19,20 +19,22 @@ sys.path.append(meshcat_path)
 ###############################################################################
 #DEPENDENCIES
 ###############################################################################
-from compression import zstd
 import time
 from warnings import warn
+from queue import (Queue, Full)
 from threading import (Thread, Lock)
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import meshcat
 import meshcat.geometry as geo
 import umsgpack
 import cv2
-from condynsate.misc import save_recording
+from condynsate.misc import VideoStream
 from condynsate.visualizer.utilities import (is_instance, is_num, is_nvector,
                                              path_valid, name_valid)
 from condynsate.visualizer.utilities import homogeneous_transform
 from condynsate.visualizer.utilities import get_scene_path
+MAX_QUEUED_FRAMES = 60
 
 ###############################################################################
 #VISUALIZER CLASS
@@ -48,7 +50,10 @@ class Visualizer():
         unlimited. This is not recommended because it can cause communication
         bottlenecks that cause slow downs. The default value is 45.
     record : bool, optional
-        A boolean flag that indicates if the visualizer will record.
+        A boolean flag that indicates if the visualizer will record. Frames
+        are encoded as they are recorded and the video is finished by the
+        terminate function call. The saved file name has the form
+        visualizer.mp4
 
     Attributes
     ----------
@@ -80,10 +85,26 @@ class Visualizer():
         # we can ignore requests that would not change these.
         self._objects = {}
 
+        # Cache each loaded mesh by its path so that bodies that share a
+        # mesh file only read and parse it once. Meshes are loaded by a
+        # background worker as soon as an object is queued to be added, so
+        # reading mesh files overlaps with the rest of the user's setup.
+        self._geometries = {}
+        self._GEO_LOCK = Lock()
+        self._loader = ThreadPoolExecutor(max_workers=1)
+
         # Recording support
         self.record = record
-        self._frames = []
-        self._frame_ticks = []
+        self._video = None
+        self._record_q = None
+        self._record_thread = None
+        if self.record:
+            fps = 1.0/self.frame_delta if self.frame_delta > 0.0 else 120.0
+            self._video = VideoStream('visualizer', fps)
+            self._record_q = Queue(maxsize=MAX_QUEUED_FRAMES)
+            self._record_thread = Thread(target=self._record_loop,
+                                         daemon=True)
+            self._record_thread.start()
 
         # Start the main thread
         self._actions_buf = {}
@@ -135,7 +156,10 @@ class Visualizer():
             # Time since last frame was rendered
             dt = (cv2.getTickCount()-self._last_refresh)/cv2.getTickFrequency()
             if dt < self.frame_delta:
-                # time.sleep(0.008333) # Remove CPU stress (120 FPS)
+                # Sleep until the next frame is due instead of spinning. While
+                # asleep, the actions buffer keeps only the latest action for
+                # each scene path, so stale updates are dropped
+                time.sleep(self.frame_delta - dt)
                 continue
 
             # Aquire mutex lock to read flags and shared buffer
@@ -174,13 +198,44 @@ class Visualizer():
                 fnc(*args, **kwargs)
             self._last_refresh = cv2.getTickCount()
 
-            # If recording, save the current image
+            # If recording, send the current RGB image to be encoded. If the
+            # encoder has fallen too far behind, the frame is dropped and the
+            # previous frame is held in the video instead
             if self.record:
                 image = self._scene.get_image(w=800, h=600)
-                image = np.array(image, dtype=np.uint8)[:, :, :-1].copy()
-                self._frames.append((zstd.compress(image, level=1),
-                                     image.shape))
-                self._frame_ticks.append(self._last_refresh)
+                image = np.asarray(image, dtype=np.uint8)[:, :, :3]
+                try:
+                    self._record_q.put_nowait((image, self._last_refresh))
+                except Full:
+                    pass
+
+    def _record_loop(self):
+        """
+        Streams recorded frames to the video until a None frame is received.
+        A frame whose image is None discards the video recorded so far. Runs
+        in its own thread so that encoding is kept off of the main loop. If a
+        frame fails to encode, later frames are drained but not written until
+        the video is discarded.
+
+        Returns
+        -------
+        None.
+
+        """
+        tick_freq = cv2.getTickFrequency()
+        failed = False
+        while True:
+            frame = self._record_q.get()
+            if frame is None:
+                self._record_q.task_done()
+                return
+            image, tick = frame
+            if image is None:
+                self._video.discard()
+                failed = False
+            elif not failed:
+                failed = self._video.write(image, tick/tick_freq) < 0
+            self._record_q.task_done()
 
     def _fnc_priority(self, fnc):
         """
@@ -250,6 +305,41 @@ class Visualizer():
             self._actions_buf[fnc][scene_path] = (args, kwargs)
             return 0
 
+    def _queue_actions(self, fnc, actions):
+        """
+        Queues a function to many scene objects at once for execution on the
+        next frame time. The actions buffer mutex lock is aquired only once.
+
+        Parameters
+        ----------
+        fnc : function
+            A function pointer.
+        actions : list of 2 tuples
+            Each tuple has the form (scene_path, args) where scene_path is the
+            scene path to the object on which the function is operated and
+            args are the star args applied to function fnc.
+
+        Returns
+        -------
+        ret_code : int
+            0 if successful, -1 if something went wrong.
+
+        """
+        # Aquire mutex lock to interact with actions buffer
+        with self._LOCK:
+            if self._socket.closed or self._done:
+                msg = "Cannot complete action because visualizer is stopped."
+                warn(msg, UserWarning)
+                return -1
+
+            # Add or overwrite the args applied to each object
+            if not fnc in self._actions_buf:
+                self._actions_buf[fnc] = {}
+            fnc_buf = self._actions_buf[fnc]
+            for scene_path, args in actions:
+                fnc_buf[scene_path] = (args, {})
+            return 0
+
     def _set_defaults(self):
         """
         Sets the default scene settings
@@ -967,7 +1057,49 @@ class Visualizer():
         args = (aspect, fov, near, far, )
         return self._queue_action(self._set_cam_frustum, scene_path, args)
 
+    def _prefetch_geometry(self, path):
+        """
+        Starts loading an object's mesh in the background if it is not
+        already loaded or being loaded.
+
+        Parameters
+        ----------
+        path : string
+            Path pointing to the file that describes the object's
+            geometry. The file may be of type .obj, .stl, or .dae.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            The future whose result is the object's mesh.
+
+        """
+        with self._GEO_LOCK:
+            if not path in self._geometries:
+                future = self._loader.submit(self._load_geometry, path)
+                self._geometries[path] = future
+            return self._geometries[path]
+
     def _get_geometry(self, path):
+        """
+        Gets an object's mesh. Meshes are cached by path, so each file is
+        only read once.
+
+        Parameters
+        ----------
+        path : string
+            Path pointing to the file that describes the object's
+            geometry. The file may be of type .obj, .stl, or .dae.
+
+        Returns
+        -------
+        geometry : meshcat.geometry.ObjMeshGeometry
+            The object's mesh.
+
+        """
+        return self._prefetch_geometry(path).result()
+
+    def _load_geometry(self, path):
         """
         Loads an object's mesh.
 
@@ -1221,11 +1353,12 @@ class Visualizer():
         material_kwargs = self._read_material_kwargs(kwargs)
         transform_kwargs = self._read_transform_kwargs(kwargs)
 
-        # Queue loading the object into the scene
+        # Queue loading the object into the scene and start loading its mesh
         args = (name, path, material_kwargs, )
         ret_code = self._queue_action(self._add_object, scene_path, args)
         if ret_code < 0:
             return ret_code
+        self._prefetch_geometry(path)
 
         # Queue transforming the object
         args = (name, transform_kwargs, )
@@ -1397,6 +1530,40 @@ class Visualizer():
         args = (name, transform_kwargs, )
         return self._queue_action(self._set_transform, scene_path, args)
 
+    def set_transforms(self, transforms):
+        """
+        Sets the position, orientation, and scale of many scene objects at
+        once. This is equivalent to, but faster than, calling set_transform
+        once for each object.
+
+        Parameters
+        ----------
+        transforms : list of dicts
+            Each dict must have the key 'name', which is the name of the
+            object being transformed (see set_transform). Any other keys that
+            are set_transform keyword args are applied to that object. All
+            other keys are ignored.
+
+        Returns
+        -------
+        ret_code : int
+            0 if successful, -1 if something went wrong. When something went
+            wrong, no objects are transformed.
+
+        """
+        # Check the args and build each action
+        actions = []
+        for kwargs in transforms:
+            name = kwargs.get('name', None)
+            if not name_valid(name, arg_name='name'):
+                return -1
+            transform_kwargs = self._read_transform_kwargs(kwargs)
+            args = (name, transform_kwargs, )
+            actions.append((get_scene_path(name), args))
+
+        # Queue transforming all of the objects
+        return self._queue_actions(self._set_transform, actions)
+
     def _read_material_kwargs(self, kwargs):
         """
         Reads and sanitizes the kwargs for function self.set_material.
@@ -1607,8 +1774,11 @@ class Visualizer():
             0 if successful, -1 if something went wrong.
 
         """
-        self._frames = []
-        self._frame_ticks = []
+        # Discard the recording in the record thread, after all pending
+        # frames, because the main loop may still be recording new frames
+        if not self._record_q is None:
+            self._record_q.put((None, None))
+            self._record_q.join()
         return 0
 
     def terminate(self):
@@ -1627,19 +1797,21 @@ class Visualizer():
 
         self._actions_buf = {}
         self._objects = {}
+        self._loader.shutdown(wait=False, cancel_futures=True)
 
-        if self.record and len(self._frames) > 1:
-            # Convert frame ticks to frame times
+        # Finish encoding all recorded frames and save the recording
+        ret_code = 0
+        if not self._record_thread is None:
             print('Saving visualizer recording...')
-            frame_times = np.array(self._frame_ticks, dtype=float)
-            frame_times /= cv2.getTickFrequency()
-            frame_times -= frame_times[0]
-            save_recording(self._frames, frame_times, 'visualizer')
-        self._frames = []
-        self._frame_ticks = []
+            self._record_q.put(None)
+            self._record_thread.join()
+            ret_code = self._video.close()
+        self._video = None
+        self._record_q = None
+        self._record_thread = None
 
         if not self._socket.closed:
             self._scene.delete()
             self._socket.close()
-            return 0
+            return ret_code
         return -1